@@ -1,39 +1,98 @@
 """API dependencies for dependency injection."""
 
+from collections.abc import Iterator
+from functools import lru_cache
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, File, HTTPException, UploadFile, status
 
 from app.core.config import Settings, get_settings
+from app.services.analysis_cache import AnalysisCache, MethodGraphCache
 from app.services.java_parser import JavaParser
 from app.services.cfg_builder import CFGBuilder
 from app.services.ddg_builder import DDGBuilder
 from app.services.graph_converter import GraphConverter
+from app.utils.pool import ObjectPool
 
 
-def get_java_parser() -> JavaParser:
-    """Get Java parser instance."""
-    return JavaParser()
+# The parser and DDG builder keep per-call state, so each one is lent to a
+# single user at a time and returned to its pool afterwards.
+@lru_cache
+def get_java_parser_pool() -> ObjectPool[JavaParser]:
+    """Get the shared Java parser pool."""
+    return ObjectPool(JavaParser, max_size=get_settings().pool_size)
 
 
-def get_cfg_builder() -> CFGBuilder:
-    """Get CFG builder instance."""
-    return CFGBuilder()
+@lru_cache
+def get_ddg_builder_pool() -> ObjectPool[DDGBuilder]:
+    """Get the shared DDG builder pool."""
+    return ObjectPool(DDGBuilder, max_size=get_settings().pool_size)
+
+
+def get_java_parser() -> Iterator[JavaParser]:
+    """Borrow a Java parser for the duration of a request."""
+    with get_java_parser_pool().borrow() as parser:
+        yield parser
 
 
-def get_ddg_builder() -> DDGBuilder:
-    """Get DDG builder instance."""
-    return DDGBuilder()
+def get_ddg_builder() -> Iterator[DDGBuilder]:
+    """Borrow a DDG builder for the duration of a request."""
+    with get_ddg_builder_pool().borrow() as builder:
+        yield builder
+
+
+@lru_cache(maxsize=1)
+def get_cfg_builder() -> CFGBuilder:
+    """Get the shared CFG builder (keeps its build state per call)."""
+    return CFGBuilder()
 
 
+@lru_cache(maxsize=1)
 def get_graph_converter() -> GraphConverter:
-    """Get graph converter instance."""
+    """Get the shared graph converter (stateless)."""
     return GraphConverter()
 
 
+@lru_cache
+def get_analysis_cache() -> AnalysisCache:
+    """Get the shared analysis response cache."""
+    return AnalysisCache(max_size=get_settings().analysis_cache_size)
+
+
+@lru_cache
+def get_method_graph_cache() -> MethodGraphCache:
+    """Get the shared method graph cache."""
+    return MethodGraphCache(max_size=get_settings().method_cache_size)
+
+
 # Type aliases for dependency injection
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 JavaParserDep = Annotated[JavaParser, Depends(get_java_parser)]
 CFGBuilderDep = Annotated[CFGBuilder, Depends(get_cfg_builder)]
 DDGBuilderDep = Annotated[DDGBuilder, Depends(get_ddg_builder)]
 GraphConverterDep = Annotated[GraphConverter, Depends(get_graph_converter)]
+AnalysisCacheDep = Annotated[AnalysisCache, Depends(get_analysis_cache)]
+MethodGraphCacheDep = Annotated[MethodGraphCache, Depends(get_method_graph_cache)]
+
+
+def validate_upload(
+    file: Annotated[UploadFile, File(description="Java source file to analyze")],
+    settings: SettingsDep,
+) -> None:
+    """Reject non-Java or oversized uploads before the route handler runs.
+
+    FastAPI parses the form before solving dependencies, so bodies over the
+    size limit are already cut off by ``RequestSizeLimitMiddleware``; this
+    checks the file name and the declared part size.
+    """
+    if not file.filename or not file.filename.endswith(".java"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be a Java source file (.java)",
+        )
+
+    if file.size is not None and file.size > settings.max_file_size_mb * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds maximum size of {settings.max_file_size_mb}MB",
+        )
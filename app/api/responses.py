@@ -0,0 +1,17 @@
+"""Response classes for API routes."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Much faster than the stdlib encoder for large graph payloads, and encodes
+    enums and NumPy arrays natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
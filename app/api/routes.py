@@ -1,22 +1,31 @@
 """API routes for Java code analysis."""
 
+import asyncio
+import codecs
 from typing import Annotated
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile, status
+from pydantic import TypeAdapter
 
 from app.api.dependencies import (
+    AnalysisCacheDep,
+    MethodGraphCacheDep,
     SettingsDep,
     JavaParserDep,
     CFGBuilderDep,
     DDGBuilderDep,
     GraphConverterDep,
+    get_cfg_builder,
+    get_ddg_builder_pool,
+    get_graph_converter,
+    validate_upload,
 )
+from app.core.executor import run_in_process_pool
 from app.core.exceptions import (
     JavaParseError,
     InvalidJavaCodeError,
     CFGBuildError,
     DDGBuildError,
-    FileTooLargeError,
 )
 from app.models.schemas import (
     AnalyzeCodeRequest,
@@ -26,16 +35,31 @@ from app.models.schemas import (
     ErrorResponse,
     HealthResponse,
 )
-from app.models.graph_models import GraphOutput
+from app.models.graph_models import GraphFormat
+from app.services.java_parser import ParsedClass, ParsedMethod, class_without_ast, method_without_ast
 
 
 router = APIRouter(tags=["analysis"])
 
+# Upload read size; bounds memory held per read while streaming files
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Methods sent to a pool worker per task; one task per method spends more on
+# pickling and process round trips than on building small methods
+_METHODS_PER_TASK = 16
+
+# Serializers built once and reused; routes return raw JSON responses so
+# FastAPI skips re-validating the response model (response_model is kept for
+# the OpenAPI schema only)
+_ANALYZE_ADAPTER = TypeAdapter(AnalyzeResponse)
+_HEALTH_ADAPTER = TypeAdapter(HealthResponse)
+
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(settings: SettingsDep) -> HealthResponse:
+async def health_check(settings: SettingsDep) -> Response:
     """Health check endpoint."""
-    return HealthResponse(status="healthy", version=settings.api_version)
+    health = HealthResponse(status="healthy", version=settings.api_version)
+    return Response(_HEALTH_ADAPTER.dump_json(health), media_type="application/json")
 
 
 @router.post(
@@ -43,44 +67,43 @@ async def health_check(settings: SettingsDep) -> HealthResponse:
     response_model=AnalyzeResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid Java code"},
-        422: {"model": ErrorResponse, "description": "Parsing error"},
+        413: {"model": ErrorResponse, "description": "Request body too large"},
+        422: {"model": ErrorResponse, "description": "Parsing error or code too long"},
     },
 )
 async def analyze_code(
     request: AnalyzeCodeRequest,
     parser: JavaParserDep,
-    cfg_builder: CFGBuilderDep,
-    ddg_builder: DDGBuilderDep,
-    converter: GraphConverterDep,
-    settings: SettingsDep,
-) -> AnalyzeResponse:
+    cache: AnalysisCacheDep,
+    method_cache: MethodGraphCacheDep,
+) -> Response:
     """Analyze Java code string and generate CFG/DDG.
 
     Returns control flow graphs and data dependence graphs for each method,
     plus optional class-level combined graphs. Output is formatted for
     transformer model input.
-    """
-    # Validate code length
-    if len(request.code) > settings.max_code_length:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Code exceeds maximum length of {settings.max_code_length} characters",
-        )
 
-    return await _analyze_java_code(
+    Only the graph formats listed in ``formats`` are built ("edge_list" by
+    default); add "adjacency_matrix" and/or "sequence" to receive those too.
+    Formats that are not requested come back as empty objects.
+    """
+    response, cache_hit = await _analyze_cached(
         code=request.code,
         include_method_graphs=request.include_method_graphs,
         include_class_graph=request.include_class_graph,
+        formats=request.formats,
         parser=parser,
-        cfg_builder=cfg_builder,
-        ddg_builder=ddg_builder,
-        converter=converter,
+        cache=cache,
+        method_cache=method_cache,
     )
 
+    return _analyze_json_response(response, cache_hit)
+
 
 @router.post(
     "/analyze/file",
     response_model=AnalyzeResponse,
+    dependencies=[Depends(validate_upload)],
     responses={
         400: {"model": ErrorResponse, "description": "Invalid file or code"},
         413: {"model": ErrorResponse, "description": "File too large"},
@@ -90,68 +113,119 @@ async def analyze_code(
 async def analyze_file(
     file: Annotated[UploadFile, File(description="Java source file to analyze")],
     parser: JavaParserDep,
-    cfg_builder: CFGBuilderDep,
-    ddg_builder: DDGBuilderDep,
-    converter: GraphConverterDep,
+    cache: AnalysisCacheDep,
+    method_cache: MethodGraphCacheDep,
     settings: SettingsDep,
     include_class_graph: Annotated[bool, Form()] = True,
     include_method_graphs: Annotated[bool, Form()] = True,
-) -> AnalyzeResponse:
+    formats: Annotated[set[GraphFormat], Form()] = {"edge_list"},
+) -> Response:
     """Analyze uploaded Java file and generate CFG/DDG.
 
     Accepts a .java file upload and returns control flow graphs and
-    data dependence graphs in transformer-ready formats.
+    data dependence graphs in transformer-ready formats. Repeat the
+    ``formats`` field to choose which graph formats are built
+    ("edge_list" by default).
     """
-    # Validate file type
-    if not file.filename or not file.filename.endswith(".java"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be a Java source file (.java)",
-        )
-
-    # Read file content
-    content = await file.read()
-
-    # Check file size
+    # The declared size was checked up front; enforce it on the bytes read too
     max_size = settings.max_file_size_mb * 1024 * 1024
-    if len(content) > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File exceeds maximum size of {settings.max_file_size_mb}MB",
-        )
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds maximum size of {settings.max_file_size_mb}MB",
+    )
 
+    # Read and decode in chunks so oversized or non-UTF-8 files fail early
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts: list[str] = []
+    total = 0
     try:
-        code = content.decode("utf-8")
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > max_size:
+                raise too_large
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
     except UnicodeDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be UTF-8 encoded",
         )
+    code = "".join(parts)
+
+    response, cache_hit = await _analyze_cached(
+        code=code,
+        include_method_graphs=include_method_graphs,
+        include_class_graph=include_class_graph,
+        formats=formats,
+        parser=parser,
+        cache=cache,
+        method_cache=method_cache,
+    )
+
+    # Cached responses are shared, so attach the file name to a copy
+    response = response.model_copy(update={"source_file": file.filename})
+    return _analyze_json_response(response, cache_hit)
+
+
+def _analyze_json_response(response: AnalyzeResponse, cache_hit: bool) -> Response:
+    """Serialize an analysis response straight to JSON bytes."""
+    return Response(
+        _ANALYZE_ADAPTER.dump_json(response),
+        media_type="application/json",
+        headers=_cache_headers(cache_hit),
+    )
+
+
+async def _analyze_cached(
+    code: str,
+    include_method_graphs: bool,
+    include_class_graph: bool,
+    formats: set[GraphFormat],
+    parser: JavaParserDep,
+    cache: AnalysisCacheDep,
+    method_cache: MethodGraphCacheDep,
+) -> tuple[AnalyzeResponse, bool]:
+    """Analyze Java code, reusing a cached response for identical requests.
+
+    Returns:
+        Tuple of (response, whether it came from the cache).
+    """
+    key = cache.make_key(code, include_method_graphs, include_class_graph, formats)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
 
     response = await _analyze_java_code(
         code=code,
         include_method_graphs=include_method_graphs,
         include_class_graph=include_class_graph,
+        formats=formats,
         parser=parser,
-        cfg_builder=cfg_builder,
-        ddg_builder=ddg_builder,
-        converter=converter,
+        method_cache=method_cache,
     )
+    cache.put(key, response)
+    return response, False
 
-    response.source_file = file.filename
-    return response
+
+def _cache_headers(cache_hit: bool) -> dict[str, str]:
+    """Build the X-Cache header reporting whether the analysis cache was hit."""
+    return {"X-Cache": "HIT" if cache_hit else "MISS"}
 
 
 async def _analyze_java_code(
     code: str,
     include_method_graphs: bool,
     include_class_graph: bool,
+    formats: set[GraphFormat],
     parser: JavaParserDep,
-    cfg_builder: CFGBuilderDep,
-    ddg_builder: DDGBuilderDep,
-    converter: GraphConverterDep,
+    method_cache: MethodGraphCacheDep,
 ) -> AnalyzeResponse:
-    """Internal function to analyze Java code."""
+    """Internal function to analyze Java code.
+
+    Method and class graphs are independent of each other, so they are built
+    concurrently in the shared process pool instead of on the event loop.
+    Method graphs already built for an identical method are reused.
+    """
     errors: list[str] = []
     warnings: list[str] = []
     method_graphs: list[MethodGraph] = []
@@ -159,8 +233,8 @@ async def _analyze_java_code(
     class_name = ""
 
     try:
-        # Parse Java code
-        parsed_classes = parser.parse(code)
+        # Parse Java code off the event loop
+        parsed_classes = await asyncio.to_thread(parser.parse, code)
 
         if not parsed_classes:
             raise InvalidJavaCodeError("No classes found in the provided code")
@@ -169,32 +243,37 @@ async def _analyze_java_code(
         for parsed_class in parsed_classes:
             class_name = parsed_class.name
 
-            # Build method-level graphs
+            # Build method-level graphs and the class-level graph alongside
+            # them; gathering them together means no build is left running
+            # when another fails
+            builds = []
             if include_method_graphs:
-                for method in parsed_class.methods:
-                    try:
-                        method_graph = _build_method_graph(
-                            method=method,
-                            class_name=parsed_class.name,
-                            cfg_builder=cfg_builder,
-                            ddg_builder=ddg_builder,
-                            converter=converter,
-                        )
-                        method_graphs.append(method_graph)
-                    except (CFGBuildError, DDGBuildError) as e:
-                        errors.append(f"Error processing method {method.name}: {e.message}")
-
-            # Build class-level graph
+                builds.append(
+                    _build_method_graphs_cached(parsed_class.methods, parsed_class.name, formats, method_cache)
+                )
             if include_class_graph:
-                try:
-                    class_graph = _build_class_graph(
-                        parsed_class=parsed_class,
-                        cfg_builder=cfg_builder,
-                        ddg_builder=ddg_builder,
-                        converter=converter,
-                    )
-                except (CFGBuildError, DDGBuildError) as e:
-                    errors.append(f"Error building class graph: {e.message}")
+                builds.append(
+                    run_in_process_pool(_build_class_graph_worker, class_without_ast(parsed_class), formats)
+                )
+
+            results = await asyncio.gather(*builds, return_exceptions=True)
+            method_results = results.pop(0) if include_method_graphs else []
+            class_result = results.pop() if include_class_graph else None
+
+            if isinstance(method_results, BaseException):
+                raise method_results
+            for method, result in zip(parsed_class.methods, method_results):
+                if isinstance(result, (CFGBuildError, DDGBuildError)):
+                    errors.append(f"Error processing method {method.name}: {result.message}")
+                else:
+                    method_graphs.append(result)
+
+            if isinstance(class_result, (CFGBuildError, DDGBuildError)):
+                errors.append(f"Error building class graph: {class_result.message}")
+            elif isinstance(class_result, BaseException):
+                raise class_result
+            elif class_result is not None:
+                class_graph = class_result
 
         return AnalyzeResponse(
             success=True,
@@ -218,9 +297,87 @@ async def _analyze_java_code(
         )
 
 
+async def _build_method_graphs_cached(
+    methods: list[ParsedMethod],
+    class_name: str,
+    formats: set[GraphFormat],
+    method_cache: MethodGraphCacheDep,
+) -> list[MethodGraph | CFGBuildError | DDGBuildError]:
+    """Build method graphs in the process pool, reusing identical cached ones.
+
+    Methods missing from the cache are sent without their AST, in batches
+    of ``_METHODS_PER_TASK``. Build errors are returned in place of the
+    graph of the method that failed.
+    """
+    keys = [method_cache.make_key(method, class_name, formats) for method in methods]
+    results: list[MethodGraph | CFGBuildError | DDGBuildError | None] = [
+        method_cache.get(key) for key in keys
+    ]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    batches = [missing[i : i + _METHODS_PER_TASK] for i in range(0, len(missing), _METHODS_PER_TASK)]
+    built = await asyncio.gather(
+        *(
+            run_in_process_pool(
+                _build_method_graphs_worker,
+                [method_without_ast(methods[i]) for i in batch],
+                class_name,
+                formats,
+            )
+            for batch in batches
+        ),
+        return_exceptions=True,
+    )
+
+    for batch, batch_results in zip(batches, built):
+        if isinstance(batch_results, BaseException):
+            raise batch_results
+        for i, result in zip(batch, batch_results):
+            results[i] = result
+            if isinstance(result, MethodGraph):
+                method_cache.put(keys[i], result)
+    return results
+
+
+def _build_method_graphs_worker(
+    methods: list[ParsedMethod], class_name: str, formats: set[GraphFormat]
+) -> list[MethodGraph | CFGBuildError | DDGBuildError]:
+    """Build a batch of method graphs inside a pool worker using process-local services."""
+    results: list[MethodGraph | CFGBuildError | DDGBuildError] = []
+    with get_ddg_builder_pool().borrow() as ddg_builder:
+        for method in methods:
+            try:
+                results.append(
+                    _build_method_graph(
+                        method=method,
+                        class_name=class_name,
+                        formats=formats,
+                        cfg_builder=get_cfg_builder(),
+                        ddg_builder=ddg_builder,
+                        converter=get_graph_converter(),
+                    )
+                )
+            except (CFGBuildError, DDGBuildError) as e:
+                results.append(e)
+    return results
+
+
+def _build_class_graph_worker(parsed_class: ParsedClass, formats: set[GraphFormat]) -> ClassGraph:
+    """Build a class graph inside a pool worker using process-local services."""
+    with get_ddg_builder_pool().borrow() as ddg_builder:
+        return _build_class_graph(
+            parsed_class=parsed_class,
+            formats=formats,
+            cfg_builder=get_cfg_builder(),
+            ddg_builder=ddg_builder,
+            converter=get_graph_converter(),
+        )
+
+
 def _build_method_graph(
     method,
     class_name: str,
+    formats: set[GraphFormat],
     cfg_builder: CFGBuilderDep,
     ddg_builder: DDGBuilderDep,
     converter: GraphConverterDep,
@@ -228,11 +385,11 @@ def _build_method_graph(
     """Build CFG and DDG for a single method."""
     # Build CFG
     cfg_graph, cfg_nodes, cfg_edges = cfg_builder.build_method_cfg(method)
-    cfg_output = converter.convert(cfg_graph, cfg_nodes, cfg_edges)
+    cfg_output = converter.convert(cfg_graph, cfg_nodes, cfg_edges, formats)
 
     # Build DDG
     ddg_graph, ddg_nodes, ddg_edges = ddg_builder.build_method_ddg(method, cfg_nodes)
-    ddg_output = converter.convert(ddg_graph, ddg_nodes, ddg_edges)
+    ddg_output = converter.convert(ddg_graph, ddg_nodes, ddg_edges, formats)
 
     return MethodGraph(
         method_name=method.name,
@@ -248,6 +405,7 @@ def _build_method_graph(
 
 def _build_class_graph(
     parsed_class,
+    formats: set[GraphFormat],
     cfg_builder: CFGBuilderDep,
     ddg_builder: DDGBuilderDep,
     converter: GraphConverterDep,
@@ -255,11 +413,11 @@ def _build_class_graph(
     """Build combined CFG and DDG for a class."""
     # Build class-level CFG
     cfg_graph, cfg_nodes, cfg_edges = cfg_builder.build_class_cfg(parsed_class)
-    cfg_output = converter.convert(cfg_graph, cfg_nodes, cfg_edges)
+    cfg_output = converter.convert(cfg_graph, cfg_nodes, cfg_edges, formats)
 
     # Build class-level DDG
     ddg_graph, ddg_nodes, ddg_edges = ddg_builder.build_class_ddg(parsed_class, cfg_nodes)
-    ddg_output = converter.convert(ddg_graph, ddg_nodes, ddg_edges)
+    ddg_output = converter.convert(ddg_graph, ddg_nodes, ddg_edges, formats)
 
     return ClassGraph(
         class_name=parsed_class.name,
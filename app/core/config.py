@@ -28,6 +28,12 @@ class Settings(BaseSettings):
     # Parser Settings
     max_file_size_mb: int = 10
     max_code_length: int = 100000
+    analysis_cache_size: int = 256  # Cached responses; 0 disables the cache
+    method_cache_size: int = 4096  # Cached method graphs; 0 disables the cache
+
+    # Concurrency Settings
+    workers: int | None = None  # Process pool size; None uses os.cpu_count()
+    pool_size: int = 8  # Idle parser/builder instances kept for reuse
 
 
 @lru_cache
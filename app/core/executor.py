@@ -0,0 +1,63 @@
+"""Process pool for offloading CPU-bound graph construction."""
+
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from app.core.config import get_settings
+from app.services.graph_converter import warm_up_kernels
+
+T = TypeVar("T")
+
+
+@lru_cache
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use.
+
+    Each worker loads the compiled graph kernels as it starts.
+    """
+    return ProcessPoolExecutor(max_workers=get_settings().workers, initializer=warm_up_kernels)
+
+
+async def run_in_process_pool(func: Callable[..., T], *args: Any) -> T:
+    """Run ``func(*args)`` in the shared process pool.
+
+    A pool whose worker died (OOM kill, crash in a native kernel) stays
+    broken for good, so it is replaced and the call retried once.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        _discard_process_pool(pool)
+        return await loop.run_in_executor(get_process_pool(), func, *args)
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next get_process_pool() builds a fresh one.
+
+    Calls failing together on the same broken pool replace it only once.
+    """
+    if get_process_pool.cache_info().currsize and get_process_pool() is pool:
+        get_process_pool.cache_clear()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def warm_process_pool() -> None:
+    """Start every pool worker up front so the first request skips the fork cost."""
+    pool = get_process_pool()
+    loop = asyncio.get_running_loop()
+    worker_count = get_settings().workers or os.cpu_count() or 1
+    await asyncio.gather(*(loop.run_in_executor(pool, os.getpid) for _ in range(worker_count)))
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool if it has been created."""
+    if get_process_pool.cache_info().currsize:
+        get_process_pool().shutdown()
+        get_process_pool.cache_clear()
@@ -1,21 +1,32 @@
 """FastAPI application entry point."""
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.responses import ORJSONResponse
 from app.api.routes import router
 from app.core.config import get_settings
+from app.core.executor import shutdown_process_pool, warm_process_pool
+from app.core.middleware import RequestSizeLimitMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager."""
     # Startup
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=os.cpu_count())
+    )
+    await warm_process_pool()
     yield
     # Shutdown
+    shutdown_process_pool()
 
 
 def create_app() -> FastAPI:
@@ -27,11 +38,24 @@ def create_app() -> FastAPI:
         description=settings.api_description,
         version=settings.api_version,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url=f"{settings.api_prefix}/docs",
         redoc_url=f"{settings.api_prefix}/redoc",
         openapi_url=f"{settings.api_prefix}/openapi.json",
     )
 
+    # Drop oversized bodies before they are spooled or decoded. A character of
+    # code is at most 4 bytes of UTF-8; the 64 KiB slack covers JSON escaping,
+    # the other request fields and multipart framing. Added before CORS so
+    # CORS wraps it and 413 responses still carry the CORS headers.
+    app.add_middleware(
+        RequestSizeLimitMiddleware,
+        path_limits={
+            f"{settings.api_prefix}/analyze": settings.max_code_length * 4 + 64 * 1024,
+            f"{settings.api_prefix}/analyze/file": settings.max_file_size_mb * 1024 * 1024 + 64 * 1024,
+        },
+    )
+
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -59,4 +83,6 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        loop="uvloop",
+        http="httptools",
     )
@@ -1,61 +1,93 @@
 """Graph node and edge models for CFG and DDG representation."""
 
-from enum import Enum
-from typing import Any
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import dataclasses as pydantic_dataclasses
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, WithJsonSchema, field_serializer, field_validator
 
 
-class NodeType(str, Enum):
+class NodeType(IntEnum):
     """Types of nodes in the control flow graph."""
 
-    ENTRY = "ENTRY"
-    EXIT = "EXIT"
-    STATEMENT = "STATEMENT"
-    CONDITION = "CONDITION"
-    LOOP_HEADER = "LOOP_HEADER"
-    SWITCH = "SWITCH"
-    CASE = "CASE"
-    TRY = "TRY"
-    CATCH = "CATCH"
-    FINALLY = "FINALLY"
-    THROW = "THROW"
-    RETURN = "RETURN"
-    BREAK = "BREAK"
-    CONTINUE = "CONTINUE"
-    ASSIGNMENT = "ASSIGNMENT"
-    DECLARATION = "DECLARATION"
-    METHOD_CALL = "METHOD_CALL"
-    METHOD_ENTRY = "METHOD_ENTRY"
-    METHOD_EXIT = "METHOD_EXIT"
-
-
-class EdgeType(str, Enum):
+    ENTRY = 0
+    EXIT = 1
+    STATEMENT = 2
+    CONDITION = 3
+    LOOP_HEADER = 4
+    SWITCH = 5
+    CASE = 6
+    TRY = 7
+    CATCH = 8
+    FINALLY = 9
+    THROW = 10
+    RETURN = 11
+    BREAK = 12
+    CONTINUE = 13
+    ASSIGNMENT = 14
+    DECLARATION = 15
+    METHOD_CALL = 16
+    METHOD_ENTRY = 17
+    METHOD_EXIT = 18
+
+
+class EdgeType(IntEnum):
     """Types of edges in graphs."""
 
     # CFG edge types
-    SEQUENTIAL = "SEQUENTIAL"
-    TRUE_BRANCH = "TRUE_BRANCH"
-    FALSE_BRANCH = "FALSE_BRANCH"
-    LOOP_BACK = "LOOP_BACK"
-    LOOP_EXIT = "LOOP_EXIT"
-    CASE_BRANCH = "CASE_BRANCH"
-    DEFAULT_BRANCH = "DEFAULT_BRANCH"
-    EXCEPTION = "EXCEPTION"
-    FINALLY_EDGE = "FINALLY_EDGE"
-    CALL = "CALL"
-    RETURN_EDGE = "RETURN_EDGE"
+    SEQUENTIAL = 0
+    TRUE_BRANCH = 1
+    FALSE_BRANCH = 2
+    LOOP_BACK = 3
+    LOOP_EXIT = 4
+    CASE_BRANCH = 5
+    DEFAULT_BRANCH = 6
+    EXCEPTION = 7
+    FINALLY_EDGE = 8
+    CALL = 9
+    RETURN_EDGE = 10
 
     # DDG edge types
-    DATA_DEP = "DATA_DEP"
-    DEF_USE = "DEF_USE"
-    USE_DEF = "USE_DEF"
-    PARAM_IN = "PARAM_IN"
-    PARAM_OUT = "PARAM_OUT"
+    DATA_DEP = 11
+    DEF_USE = 12
+    USE_DEF = 13
+    PARAM_IN = 14
+    PARAM_OUT = 15
+
+
+# Output formats a GraphOutput can carry
+GraphFormat = Literal["edge_list", "adjacency_matrix", "sequence"]
+ALL_GRAPH_FORMATS: frozenset[GraphFormat] = frozenset({"edge_list", "adjacency_matrix", "sequence"})
+
+# Type names indexed by their integer code; types are stored and compared as
+# ints internally and only turned into names when serialized
+NODE_TYPE_NAMES: tuple[str, ...] = tuple(node_type.name for node_type in NodeType)
+EDGE_TYPE_NAMES: tuple[str, ...] = tuple(edge_type.name for edge_type in EdgeType)
+
+# NumPy array field; Python-mode dumps keep the array, JSON-mode dumps emit nested lists
+NDArray = Annotated[
+    np.ndarray,
+    PlainSerializer(lambda array: array.tolist(), when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "array", "items": {"type": "integer"}}}),
+]
 
+# One-dimensional NumPy array field, serialized like NDArray
+NDVector = Annotated[
+    np.ndarray,
+    PlainSerializer(lambda array: array.tolist(), when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "integer"}}),
+]
 
-class GraphNode(BaseModel):
-    """Represents a node in the graph."""
+
+@pydantic_dataclasses.dataclass(frozen=True, slots=True)
+class GraphNode:
+    """Represents a node in the graph.
+
+    A slotted dataclass rather than a BaseModel: graphs hold thousands of
+    nodes and edges, and slots drop the per-instance ``__dict__``.
+    """
 
     id: str = Field(..., description="Unique node identifier")
     type: NodeType = Field(..., description="Type of the node")
@@ -66,9 +98,45 @@ class GraphNode(BaseModel):
     variables_used: list[str] = Field(default_factory=list, description="Variables used at this node")
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
+    @field_validator("type", mode="before")
+    @classmethod
+    def _parse_type_name(cls, value: Any) -> Any:
+        """Accept type names as well as integer codes."""
+        return NodeType[value] if isinstance(value, str) else value
+
+    @field_serializer("type")
+    def _serialize_type(self, value: NodeType) -> str:
+        """Emit the type name rather than its integer code."""
+        return NODE_TYPE_NAMES[value]
+
+    @classmethod
+    def construct(
+        cls,
+        id: str,
+        type: NodeType,
+        code: str,
+        line_number: int | None,
+        column: int | None,
+        variables_defined: list[str],
+        variables_used: list[str],
+        metadata: dict[str, Any],
+    ) -> "GraphNode":
+        """Create a node from trusted values, skipping validation.
+
+        The graph builders already hold well-typed values from the parser,
+        so validating every node only repeats work. Lists and dicts are
+        stored as given rather than copied.
+        """
+        node = object.__new__(cls)
+        values = (id, type, code, line_number, column, variables_defined, variables_used, metadata)
+        for set_field, value in zip(_NODE_SETTERS, values):
+            set_field(node, value)
+        return node
+
 
-class GraphEdge(BaseModel):
-    """Represents an edge in the graph."""
+@pydantic_dataclasses.dataclass(frozen=True, slots=True)
+class GraphEdge:
+    """Represents an edge in the graph (slotted like GraphNode)."""
 
     source: str = Field(..., description="Source node ID")
     target: str = Field(..., description="Target node ID")
@@ -77,10 +145,155 @@ class GraphEdge(BaseModel):
     variable: str | None = Field(default=None, description="Variable associated with this edge (for DDG)")
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
+    @field_validator("type", mode="before")
+    @classmethod
+    def _parse_type_name(cls, value: Any) -> Any:
+        """Accept type names as well as integer codes."""
+        return EdgeType[value] if isinstance(value, str) else value
+
+    @field_serializer("type")
+    def _serialize_type(self, value: EdgeType) -> str:
+        """Emit the type name rather than its integer code."""
+        return EDGE_TYPE_NAMES[value]
+
+    @classmethod
+    def construct(
+        cls,
+        source: str,
+        target: str,
+        type: EdgeType,
+        label: str = "",
+        variable: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> "GraphEdge":
+        """Create an edge from trusted values, skipping validation (see GraphNode.construct)."""
+        edge = object.__new__(cls)
+        values = (source, target, type, label, variable, {} if metadata is None else metadata)
+        for set_field, value in zip(_EDGE_SETTERS, values):
+            set_field(edge, value)
+        return edge
+
+
+# Slot setters used by construct(); they bypass the frozen __setattr__
+_NODE_SETTERS = tuple(GraphNode.__dict__[name].__set__ for name in GraphNode.__slots__)
+_EDGE_SETTERS = tuple(GraphEdge.__dict__[name].__set__ for name in GraphEdge.__slots__)
+
+
+@dataclass
+class NodeTable:
+    """Columnar (struct-of-arrays) view of a node list used during conversion.
+
+    Variable lists are stored flat: node ``i`` owns
+    ``var_def_flat[var_def_offsets[i]:var_def_offsets[i + 1]]``.
+    """
+
+    ids: list[str]
+    types: np.ndarray  # uint8 NodeType codes
+    codes: list[str]
+    var_def_offsets: np.ndarray  # int32, length n + 1
+    var_def_flat: list[str]
+    var_use_offsets: np.ndarray  # int32, length n + 1
+    var_use_flat: list[str]
+    index: dict[str, int]  # node ID -> row
+
+    @classmethod
+    def from_nodes(cls, nodes: list[GraphNode]) -> "NodeTable":
+        """Build the table from a list of nodes in a single pass."""
+        ids: list[str] = []
+        type_codes: list[int] = []
+        codes: list[str] = []
+        var_def_flat: list[str] = []
+        var_use_flat: list[str] = []
+        var_def_counts: list[int] = []
+        var_use_counts: list[int] = []
+
+        for node in nodes:
+            ids.append(node.id)
+            type_codes.append(node.type)
+            codes.append(node.code)
+            var_def_flat.extend(node.variables_defined)
+            var_def_counts.append(len(node.variables_defined))
+            var_use_flat.extend(node.variables_used)
+            var_use_counts.append(len(node.variables_used))
+
+        return cls(
+            ids=ids,
+            types=np.array(type_codes, dtype=np.uint8),
+            codes=codes,
+            var_def_offsets=_offsets(var_def_counts),
+            var_def_flat=var_def_flat,
+            var_use_offsets=_offsets(var_use_counts),
+            var_use_flat=var_use_flat,
+            index={node_id: row for row, node_id in enumerate(ids)},
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def variables_defined(self, row: int) -> list[str]:
+        """Get the variables defined at a row."""
+        return self.var_def_flat[self.var_def_offsets[row]:self.var_def_offsets[row + 1]]
+
+    def variables_used(self, row: int) -> list[str]:
+        """Get the variables used at a row."""
+        return self.var_use_flat[self.var_use_offsets[row]:self.var_use_offsets[row + 1]]
+
+
+@dataclass
+class EdgeTable:
+    """Columnar view of the edges whose endpoints are both in a NodeTable."""
+
+    src: np.ndarray  # int32 source rows
+    dst: np.ndarray  # int32 target rows
+    types: np.ndarray  # uint8 EdgeType codes
+
+    @classmethod
+    def from_edges(cls, edges: list[GraphEdge], node_index: dict[str, int]) -> "EdgeTable":
+        """Build the table from a list of edges, dropping dangling ones."""
+        count = len(edges)
+        row = node_index.get
+        src = np.fromiter([row(edge.source, -1) for edge in edges], dtype=np.int32, count=count)
+        dst = np.fromiter([row(edge.target, -1) for edge in edges], dtype=np.int32, count=count)
+        types = np.fromiter([edge.type for edge in edges], dtype=np.uint8, count=count)
+
+        # Dangling endpoints map to -1; edges normally all resolve, so only
+        # filter when one does not
+        known = (src >= 0) & (dst >= 0)
+        if not known.all():
+            src, dst, types = src[known], dst[known], types[known]
+        return cls(src=src, dst=dst, types=types)
+
+    def to_csr(self, num_nodes: int) -> tuple[np.ndarray, np.ndarray]:
+        """Get the edges as CSR adjacency for vectorized graph algorithms.
+
+        Args:
+            num_nodes: Number of rows in the NodeTable the edges index into.
+
+        Returns:
+            Tuple of (indptr, indices) int32 arrays: the successors of row
+            ``i`` are ``indices[indptr[i]:indptr[i + 1]]``, in edge order.
+        """
+        order = np.argsort(self.src, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.src, minlength=num_nodes), out=indptr[1:])
+        return indptr, self.dst[order]
+
+    def __len__(self) -> int:
+        return len(self.src)
+
+
+def _offsets(counts: list[int]) -> np.ndarray:
+    """Turn per-row counts into an offsets array of length len(counts) + 1."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
 
 class EdgeListFormat(BaseModel):
     """Edge list representation for transformer input."""
 
+    model_config = ConfigDict(frozen=True)
+
     nodes: list[GraphNode] = Field(default_factory=list, description="List of graph nodes")
     edges: list[GraphEdge] = Field(default_factory=list, description="List of graph edges")
     node_count: int = Field(default=0, description="Total number of nodes")
@@ -88,27 +301,61 @@ class EdgeListFormat(BaseModel):
 
 
 class AdjacencyMatrixFormat(BaseModel):
-    """Adjacency matrix representation for transformer input."""
+    """Adjacency matrix representation for transformer input.
 
-    matrix: list[list[int]] = Field(default_factory=list, description="Adjacency matrix")
+    Large, sparse graphs come in COO form (``sparse`` set): ``matrix`` is
+    empty, the edge cells are listed in ``rows``/``cols`` in row-major
+    order and ``coo_edge_type_codes`` holds one code per listed cell.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    matrix: NDArray = Field(
+        default_factory=lambda: np.zeros((0, 0), dtype=np.int8),
+        description="Adjacency matrix (int8); empty when sparse",
+    )
     node_ids: list[str] = Field(default_factory=list, description="Node IDs in matrix order")
     node_types: list[str] = Field(default_factory=list, description="Node types in matrix order")
-    edge_types_matrix: list[list[str | None]] = Field(
-        default_factory=list, description="Edge types matrix"
+    edge_type_codes: NDArray = Field(
+        default_factory=lambda: np.zeros((0, 0), dtype=np.int16),
+        description=(
+            "Edge type code per cell (index into edge_type_vocab), -1 where there is no edge; "
+            "empty when sparse"
+        ),
+    )
+    sparse: bool = Field(default=False, description="Whether the matrix is given in COO form")
+    rows: NDVector = Field(
+        default_factory=lambda: np.zeros(0, dtype=np.int32),
+        description="Row of every edge cell when sparse",
+    )
+    cols: NDVector = Field(
+        default_factory=lambda: np.zeros(0, dtype=np.int32),
+        description="Column of every edge cell when sparse",
+    )
+    coo_edge_type_codes: NDVector = Field(
+        default_factory=lambda: np.zeros(0, dtype=np.int16),
+        description="Edge type code of every (rows[i], cols[i]) cell when sparse",
+    )
+    edge_type_vocab: list[str] = Field(
+        default_factory=lambda: list(EDGE_TYPE_NAMES), description="Edge type names indexed by code"
     )
 
 
 class SequenceFormat(BaseModel):
     """Sequence representation for transformer input."""
 
+    model_config = ConfigDict(frozen=True)
+
     tokens: list[str] = Field(default_factory=list, description="Linearized graph tokens")
     node_sequence: list[str] = Field(default_factory=list, description="Node IDs in traversal order")
     traversal_type: str = Field(default="DFS", description="Type of traversal (DFS/BFS)")
 
 
 class GraphOutput(BaseModel):
-    """Complete graph output in all formats."""
+    """Graph output; formats that were not requested are empty."""
+
+    model_config = ConfigDict(frozen=True)
 
-    edge_list: EdgeListFormat = Field(default_factory=EdgeListFormat)
-    adjacency_matrix: AdjacencyMatrixFormat = Field(default_factory=AdjacencyMatrixFormat)
-    sequence: SequenceFormat = Field(default_factory=SequenceFormat)
+    edge_list: EdgeListFormat
+    adjacency_matrix: AdjacencyMatrixFormat
+    sequence: SequenceFormat
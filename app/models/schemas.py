@@ -1,8 +1,9 @@
 """Pydantic schemas for API request and response models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from app.models.graph_models import GraphOutput
+from app.core.config import get_settings
+from app.models.graph_models import GraphFormat, GraphOutput
 
 
 class AnalyzeCodeRequest(BaseModel):
@@ -11,6 +12,7 @@ class AnalyzeCodeRequest(BaseModel):
     code: str = Field(
         ...,
         min_length=1,
+        max_length=get_settings().max_code_length,
         description="Java source code to analyze",
         json_schema_extra={"example": "public class Example { public int add(int a, int b) { return a + b; } }"},
     )
@@ -22,32 +24,42 @@ class AnalyzeCodeRequest(BaseModel):
         default=True,
         description="Whether to include method-level graphs",
     )
+    formats: set[GraphFormat] = Field(
+        default_factory=lambda: {"edge_list"},
+        description="Graph formats to build; formats not listed are returned empty",
+    )
 
 
 class MethodGraph(BaseModel):
     """Graph output for a single method."""
 
+    model_config = ConfigDict(frozen=True)
+
     method_name: str = Field(..., description="Name of the method")
     class_name: str = Field(default="", description="Name of the containing class")
     parameters: list[str] = Field(default_factory=list, description="Method parameters")
     return_type: str = Field(default="void", description="Method return type")
     line_start: int | None = Field(default=None, description="Starting line number")
     line_end: int | None = Field(default=None, description="Ending line number")
-    cfg: GraphOutput = Field(default_factory=GraphOutput, description="Control Flow Graph")
-    ddg: GraphOutput = Field(default_factory=GraphOutput, description="Data Dependence Graph")
+    cfg: GraphOutput = Field(..., description="Control Flow Graph")
+    ddg: GraphOutput = Field(..., description="Data Dependence Graph")
 
 
 class ClassGraph(BaseModel):
     """Graph output for a class (combined methods)."""
 
+    model_config = ConfigDict(frozen=True)
+
     class_name: str = Field(..., description="Name of the class")
-    cfg: GraphOutput = Field(default_factory=GraphOutput, description="Combined Control Flow Graph")
-    ddg: GraphOutput = Field(default_factory=GraphOutput, description="Combined Data Dependence Graph")
+    cfg: GraphOutput = Field(..., description="Combined Control Flow Graph")
+    ddg: GraphOutput = Field(..., description="Combined Data Dependence Graph")
 
 
 class AnalyzeResponse(BaseModel):
     """Response model for code analysis."""
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(default=True, description="Whether analysis was successful")
     source_file: str | None = Field(default=None, description="Source file name if provided")
     class_name: str = Field(default="", description="Main class name")
@@ -63,6 +75,8 @@ class AnalyzeResponse(BaseModel):
 class ErrorResponse(BaseModel):
     """Error response model."""
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(default=False)
     error: str = Field(..., description="Error message")
     details: str | None = Field(default=None, description="Additional error details")
@@ -71,5 +85,7 @@ class ErrorResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response."""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str = Field(default="healthy")
     version: str = Field(default="1.0.0")
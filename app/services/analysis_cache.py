@@ -0,0 +1,81 @@
+"""Content-addressed LRU caches for analysis responses and method graphs."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Collection
+from typing import Generic, TypeVar
+
+from app.models.schemas import AnalyzeResponse, MethodGraph
+from app.services.java_parser import ParsedMethod
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe least-recently-used cache.
+
+    Cached values are shared between requests and must not be mutated;
+    use ``model_copy(update=...)`` to derive a per-request variant.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Get a cached value and mark it as most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AnalysisCache(LRUCache[bytes, AnalyzeResponse]):
+    """LRU cache of analysis responses keyed by source digest."""
+
+    @staticmethod
+    def make_key(
+        code: str,
+        include_method_graphs: bool,
+        include_class_graph: bool,
+        formats: Collection[str],
+    ) -> bytes:
+        """Build a cache key from the source digest and every option that shapes the output."""
+        digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+        options = bytes([include_method_graphs, include_class_graph])
+        return digest + options + ",".join(sorted(formats)).encode("ascii")
+
+
+class MethodGraphCache(LRUCache[tuple[int, str, str], MethodGraph]):
+    """LRU cache of method graphs keyed by parsed-method hash.
+
+    Lets edits to one method of a class reuse the graphs of the methods
+    that did not change.
+    """
+
+    @staticmethod
+    def make_key(method: ParsedMethod, class_name: str, formats: Collection[str]) -> tuple[int, str, str]:
+        """Build a cache key from the method hash, its class and the requested formats."""
+        return method.source_hash, class_name, ",".join(sorted(formats))
@@ -1,5 +1,8 @@
 """Control Flow Graph builder from parsed Java AST."""
 
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from itertools import islice
 from typing import Any
 
 import networkx as nx
@@ -8,13 +11,132 @@ from app.models.graph_models import GraphNode, GraphEdge, NodeType, EdgeType
 from app.services.java_parser import ParsedMethod, ParsedStatement, ParsedClass
 from app.core.exceptions import CFGBuildError
 
+# Shared defaults for nodes without variables or metadata (never mutated)
+_EMPTY_LIST: list[str] = []
+_EMPTY_DICT: dict[str, Any] = {}
+
+# Node types for statements without a dedicated handler
+_STMT_TO_NODE: dict[str, NodeType] = {
+    "ASSIGNMENT": NodeType.ASSIGNMENT,
+    "DECLARATION": NodeType.DECLARATION,
+    "METHOD_CALL": NodeType.METHOD_CALL,
+    "EXPRESSION": NodeType.STATEMENT,
+    "STATEMENT": NodeType.STATEMENT,
+}
+
+
+# Edge type from a switch to each of its arms (anything else is a CASE)
+_CASE_EDGE_TYPES: dict[str, EdgeType] = {"DEFAULT": EdgeType.DEFAULT_BRANCH}
+
+
+@dataclass
+class _BuildContext:
+    """Mutable state of a single CFG build.
+
+    Nodes are referred to by integer handles (their creation index) while
+    building; IDs and GraphNode/GraphEdge objects are only made once the
+    graph is finished. A fresh context per build keeps CFGBuilder itself
+    stateless, so one builder can serve concurrent builds.
+    """
+
+    node_fields: list[tuple[Any, ...]] = field(default_factory=list)
+    # Outgoing edges per source node as target -> (type, label); like
+    # nx.DiGraph, adding an edge between the same pair again replaces it
+    out_edges: list[dict[int, tuple[EdgeType, str]]] = field(default_factory=list)
+    # Pending break/continue nodes of each enclosing loop or switch, innermost
+    # last; the construct wires them up once its own nodes exist
+    break_frames: list[list[int]] = field(default_factory=list)
+    continue_frames: list[list[int]] = field(default_factory=list)
+
+    def create_node(
+        self,
+        node_type: NodeType,
+        code: str,
+        line: int | None,
+        column: int | None = None,
+        vars_defined: list[str] | None = None,
+        vars_used: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> int:
+        """Create a new graph node and return its handle."""
+        node = len(self.node_fields)
+        self.node_fields.append(
+            (
+                node_type,
+                code,
+                line,
+                column,
+                vars_defined or _EMPTY_LIST,
+                vars_used or _EMPTY_LIST,
+                metadata or _EMPTY_DICT,
+            )
+        )
+        self.out_edges.append({})
+        return node
+
+    def enter_loop(self) -> tuple[list[int], list[int]]:
+        """Open a loop scope and get the lists its break/continue nodes collect in."""
+        breaks: list[int] = []
+        continues: list[int] = []
+        self.break_frames.append(breaks)
+        self.continue_frames.append(continues)
+        return breaks, continues
+
+    def exit_loop(self) -> None:
+        """Close the innermost loop scope."""
+        self.break_frames.pop()
+        self.continue_frames.pop()
+
+    def add_edge(
+        self,
+        source: int,
+        target: int,
+        edge_type: EdgeType,
+        label: str = "",
+    ) -> None:
+        """Add an edge between two nodes."""
+        self.out_edges[source][target] = (edge_type, label)
+
+    def export(self) -> tuple[list[GraphNode], list[GraphEdge]]:
+        """Get all nodes in creation order and all edges grouped by source node.
+
+        Node IDs are formatted once and the same string objects are shared
+        by the nodes and every edge that refers to them.
+        """
+        ids = [f"n{node}" for node in range(len(self.node_fields))]
+
+        construct_node = GraphNode.construct
+        nodes = [construct_node(node_id, *fields) for node_id, fields in zip(ids, self.node_fields)]
+
+        construct_edge = GraphEdge.construct
+        edges = [
+            construct_edge(source_id, ids[target], edge_type, label)
+            for source_id, targets in zip(ids, self.out_edges)
+            for target, (edge_type, label) in targets.items()
+        ]
+        return nodes, edges
+
 
 class CFGBuilder:
     """Builds Control Flow Graphs from parsed Java methods."""
 
     def __init__(self) -> None:
-        self._node_counter: int = 0
-        self._graph: nx.DiGraph = nx.DiGraph()
+        # Statement type -> CFG handler; anything else is a simple statement
+        self._handlers: dict[
+            str, Callable[[_BuildContext, ParsedStatement, int], tuple[int | None, list[int]]]
+        ] = {
+            "IF": self._build_if_cfg,
+            "WHILE": self._build_while_cfg,
+            "FOR": self._build_for_cfg,
+            "DO_WHILE": self._build_do_while_cfg,
+            "SWITCH": self._build_switch_cfg,
+            "TRY": self._build_try_cfg,
+            "RETURN": self._build_return_cfg,
+            "THROW": self._build_throw_cfg,
+            "BREAK": lambda ctx, stmt, exit_node: self._build_jump_cfg(ctx, stmt),
+            "CONTINUE": lambda ctx, stmt, exit_node: self._build_jump_cfg(ctx, stmt),
+            "BLOCK": self._build_block_cfg,
+        }
 
     def build_method_cfg(self, method: ParsedMethod) -> tuple[nx.DiGraph, list[GraphNode], list[GraphEdge]]:
         """Build CFG for a single method.
@@ -25,18 +147,18 @@ class CFGBuilder:
         Returns:
             Tuple of (NetworkX DiGraph, list of nodes, list of edges).
         """
-        self._reset()
+        ctx = _BuildContext()
 
         # Create entry node
-        entry_node = self._create_node(
+        entry_node = ctx.create_node(
             NodeType.METHOD_ENTRY,
             f"ENTRY: {method.name}",
             method.line_start,
-            vars_defined=method.parameters.copy(),
+            vars_defined=method.parameters,
         )
 
         # Create exit node
-        exit_node = self._create_node(
+        exit_node = ctx.create_node(
             NodeType.METHOD_EXIT,
             f"EXIT: {method.name}",
             method.line_end,
@@ -45,24 +167,23 @@ class CFGBuilder:
         # Build CFG for method body
         if method.statements:
             first_stmt_node, last_nodes = self._build_cfg_for_statements(
-                method.statements, exit_node
+                ctx, method.statements, exit_node
             )
-            if first_stmt_node:
-                self._add_edge(entry_node, first_stmt_node, EdgeType.SEQUENTIAL)
+            if first_stmt_node is not None:
+                ctx.add_edge(entry_node, first_stmt_node, EdgeType.SEQUENTIAL)
             else:
-                self._add_edge(entry_node, exit_node, EdgeType.SEQUENTIAL)
+                ctx.add_edge(entry_node, exit_node, EdgeType.SEQUENTIAL)
 
-            # Connect all terminal nodes to exit
+            # Connect all terminal nodes to exit; return/throw nodes are
+            # already wired to it and never appear among the terminals
             for last_node in last_nodes:
-                if last_node.id != exit_node.id:
-                    self._add_edge(last_node, exit_node, EdgeType.SEQUENTIAL)
+                ctx.add_edge(last_node, exit_node, EdgeType.SEQUENTIAL)
         else:
-            self._add_edge(entry_node, exit_node, EdgeType.SEQUENTIAL)
+            ctx.add_edge(entry_node, exit_node, EdgeType.SEQUENTIAL)
 
-        nodes = self._get_all_nodes()
-        edges = self._get_all_edges()
+        nodes, edges = ctx.export()
 
-        return self._graph, nodes, edges
+        return self._materialize_graph(nodes, edges), nodes, edges
 
     def build_class_cfg(self, parsed_class: ParsedClass) -> tuple[nx.DiGraph, list[GraphNode], list[GraphEdge]]:
         """Build combined CFG for all methods in a class.
@@ -73,37 +194,37 @@ class CFGBuilder:
         Returns:
             Tuple of (NetworkX DiGraph, list of nodes, list of edges).
         """
-        self._reset()
+        ctx = _BuildContext()
 
         # Create class entry node
-        class_entry = self._create_node(
+        class_entry = ctx.create_node(
             NodeType.ENTRY,
             f"CLASS: {parsed_class.name}",
             parsed_class.line_start,
         )
 
         # Create class exit node
-        class_exit = self._create_node(
+        class_exit = ctx.create_node(
             NodeType.EXIT,
             f"END CLASS: {parsed_class.name}",
             parsed_class.line_end,
         )
 
-        method_entries: list[GraphNode] = []
-        method_exits: list[GraphNode] = []
+        method_entries: list[int] = []
+        method_exits: list[int] = []
 
         for method in parsed_class.methods:
             # Create method entry
-            method_entry = self._create_node(
+            method_entry = ctx.create_node(
                 NodeType.METHOD_ENTRY,
                 f"METHOD: {method.name}",
                 method.line_start,
-                vars_defined=method.parameters.copy(),
+                vars_defined=method.parameters,
             )
             method_entries.append(method_entry)
 
             # Create method exit
-            method_exit = self._create_node(
+            method_exit = ctx.create_node(
                 NodeType.METHOD_EXIT,
                 f"END METHOD: {method.name}",
                 method.line_end,
@@ -113,44 +234,48 @@ class CFGBuilder:
             # Build CFG for method body
             if method.statements:
                 first_stmt, last_nodes = self._build_cfg_for_statements(
-                    method.statements, method_exit
+                    ctx, method.statements, method_exit
                 )
-                if first_stmt:
-                    self._add_edge(method_entry, first_stmt, EdgeType.SEQUENTIAL)
+                if first_stmt is not None:
+                    ctx.add_edge(method_entry, first_stmt, EdgeType.SEQUENTIAL)
                 else:
-                    self._add_edge(method_entry, method_exit, EdgeType.SEQUENTIAL)
+                    ctx.add_edge(method_entry, method_exit, EdgeType.SEQUENTIAL)
 
                 for last_node in last_nodes:
-                    if last_node.id != method_exit.id:
-                        self._add_edge(last_node, method_exit, EdgeType.SEQUENTIAL)
+                    ctx.add_edge(last_node, method_exit, EdgeType.SEQUENTIAL)
             else:
-                self._add_edge(method_entry, method_exit, EdgeType.SEQUENTIAL)
+                ctx.add_edge(method_entry, method_exit, EdgeType.SEQUENTIAL)
 
             # Connect to class structure
-            self._add_edge(class_entry, method_entry, EdgeType.CALL)
-            self._add_edge(method_exit, class_exit, EdgeType.RETURN_EDGE)
+            ctx.add_edge(class_entry, method_entry, EdgeType.CALL)
+            ctx.add_edge(method_exit, class_exit, EdgeType.RETURN_EDGE)
 
-        nodes = self._get_all_nodes()
-        edges = self._get_all_edges()
+        nodes, edges = ctx.export()
 
-        return self._graph, nodes, edges
+        return self._materialize_graph(nodes, edges), nodes, edges
 
     def _build_cfg_for_statements(
-        self, statements: list[ParsedStatement], exit_node: GraphNode
-    ) -> tuple[GraphNode | None, list[GraphNode]]:
-        """Build CFG for a list of statements.
+        self, ctx: _BuildContext, statements: Iterable[ParsedStatement], exit_node: int
+    ) -> tuple[int | None, list[int]]:
+        """Build CFG for a sequence of statements.
+
+        Callers skip empty statement lists themselves rather than paying for
+        a call that would only return ``(None, [])``.
 
         Returns:
             Tuple of (first node, list of terminal nodes that need connection).
         """
-        if not statements:
-            return None, []
-
-        first_node: GraphNode | None = None
-        prev_nodes: list[GraphNode] = []
-
-        for i, stmt in enumerate(statements):
-            stmt_first, stmt_last = self._build_cfg_for_statement(stmt, exit_node)
+        first_node: int | None = None
+        prev_nodes: list[int] = []
+
+        handlers = self._handlers
+        for stmt in statements:
+            # Statements without a handler (the bulk of most methods) are single nodes
+            handler = handlers.get(stmt.statement_type)
+            if handler is None:
+                stmt_first, stmt_last = self._build_simple_statement_cfg(ctx, stmt)
+            else:
+                stmt_first, stmt_last = handler(ctx, stmt, exit_node)
 
             if stmt_first is None:
                 continue
@@ -160,48 +285,25 @@ class CFGBuilder:
 
             # Connect previous nodes to current statement
             for prev in prev_nodes:
-                self._add_edge(prev, stmt_first, EdgeType.SEQUENTIAL)
+                ctx.add_edge(prev, stmt_first, EdgeType.SEQUENTIAL)
 
             prev_nodes = stmt_last
 
         return first_node, prev_nodes
 
-    def _build_cfg_for_statement(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode | None, list[GraphNode]]:
-        """Build CFG for a single statement.
-
-        Returns:
-            Tuple of (first node, list of terminal nodes).
-        """
-        if stmt.statement_type == "IF":
-            return self._build_if_cfg(stmt, exit_node)
-        elif stmt.statement_type == "WHILE":
-            return self._build_while_cfg(stmt, exit_node)
-        elif stmt.statement_type == "FOR":
-            return self._build_for_cfg(stmt, exit_node)
-        elif stmt.statement_type == "DO_WHILE":
-            return self._build_do_while_cfg(stmt, exit_node)
-        elif stmt.statement_type == "SWITCH":
-            return self._build_switch_cfg(stmt, exit_node)
-        elif stmt.statement_type == "TRY":
-            return self._build_try_cfg(stmt, exit_node)
-        elif stmt.statement_type == "RETURN":
-            return self._build_return_cfg(stmt, exit_node)
-        elif stmt.statement_type == "THROW":
-            return self._build_throw_cfg(stmt, exit_node)
-        elif stmt.statement_type in ("BREAK", "CONTINUE"):
-            return self._build_jump_cfg(stmt)
-        elif stmt.statement_type == "BLOCK":
-            return self._build_cfg_for_statements(stmt.children, exit_node)
-        else:
-            return self._build_simple_statement_cfg(stmt)
+    def _build_block_cfg(
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int | None, list[int]]:
+        """Build CFG for a nested block; empty blocks produce no nodes."""
+        if not stmt.children:
+            return None, []
+        return self._build_cfg_for_statements(ctx, stmt.children, exit_node)
 
     def _build_if_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for if statement."""
-        condition_node = self._create_node(
+        condition_node = ctx.create_node(
             NodeType.CONDITION,
             stmt.code,
             stmt.line_number,
@@ -211,20 +313,19 @@ class CFGBuilder:
             stmt.metadata,
         )
 
-        terminal_nodes: list[GraphNode] = []
-
-        # Find then and else branches in children
-        has_else = stmt.metadata.get("has_else", False)
-        mid_point = len(stmt.children) // 2 if has_else else len(stmt.children)
+        terminal_nodes: list[int] = []
 
-        then_children = stmt.children[:mid_point] if has_else else stmt.children
-        else_children = stmt.children[mid_point:] if has_else else []
+        # The parser records where the then branch ends in the children list
+        children = stmt.children
+        then_count = stmt.then_count if stmt.then_count is not None else len(children)
 
         # Build then branch
-        if then_children:
-            then_first, then_last = self._build_cfg_for_statements(then_children, exit_node)
-            if then_first:
-                self._add_edge(condition_node, then_first, EdgeType.TRUE_BRANCH, "true")
+        if then_count:
+            then_first, then_last = self._build_cfg_for_statements(
+                ctx, islice(children, then_count), exit_node
+            )
+            if then_first is not None:
+                ctx.add_edge(condition_node, then_first, EdgeType.TRUE_BRANCH, "true")
                 terminal_nodes.extend(then_last)
             else:
                 terminal_nodes.append(condition_node)
@@ -232,10 +333,12 @@ class CFGBuilder:
             terminal_nodes.append(condition_node)
 
         # Build else branch
-        if else_children:
-            else_first, else_last = self._build_cfg_for_statements(else_children, exit_node)
-            if else_first:
-                self._add_edge(condition_node, else_first, EdgeType.FALSE_BRANCH, "false")
+        if len(children) > then_count:
+            else_first, else_last = self._build_cfg_for_statements(
+                ctx, islice(children, then_count, None), exit_node
+            )
+            if else_first is not None:
+                ctx.add_edge(condition_node, else_first, EdgeType.FALSE_BRANCH, "false")
                 terminal_nodes.extend(else_last)
             else:
                 terminal_nodes.append(condition_node)
@@ -246,10 +349,10 @@ class CFGBuilder:
         return condition_node, terminal_nodes
 
     def _build_while_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for while loop."""
-        condition_node = self._create_node(
+        condition_node = ctx.create_node(
             NodeType.LOOP_HEADER,
             stmt.code,
             stmt.line_number,
@@ -260,23 +363,28 @@ class CFGBuilder:
         )
 
         # Build loop body
+        breaks, continues = ctx.enter_loop()
         if stmt.children:
-            body_first, body_last = self._build_cfg_for_statements(stmt.children, exit_node)
-            if body_first:
-                self._add_edge(condition_node, body_first, EdgeType.TRUE_BRANCH, "true")
+            body_first, body_last = self._build_cfg_for_statements(ctx, stmt.children, exit_node)
+            if body_first is not None:
+                ctx.add_edge(condition_node, body_first, EdgeType.TRUE_BRANCH, "true")
                 # Loop back edges
                 for last in body_last:
-                    self._add_edge(last, condition_node, EdgeType.LOOP_BACK)
-        
-        # Condition is the only terminal (loop exit)
-        return condition_node, [condition_node]
+                    ctx.add_edge(last, condition_node, EdgeType.LOOP_BACK)
+        ctx.exit_loop()
+
+        for node in continues:
+            ctx.add_edge(node, condition_node, EdgeType.LOOP_BACK)
+
+        # The loop exits through the condition or a break
+        return condition_node, [condition_node, *breaks]
 
     def _build_for_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for for loop."""
         # For loop header (contains init, condition, update)
-        header_node = self._create_node(
+        header_node = ctx.create_node(
             NodeType.LOOP_HEADER,
             stmt.code,
             stmt.line_number,
@@ -287,29 +395,34 @@ class CFGBuilder:
         )
 
         # Build loop body
+        breaks, continues = ctx.enter_loop()
         if stmt.children:
-            body_first, body_last = self._build_cfg_for_statements(stmt.children, exit_node)
-            if body_first:
-                self._add_edge(header_node, body_first, EdgeType.TRUE_BRANCH, "true")
+            body_first, body_last = self._build_cfg_for_statements(ctx, stmt.children, exit_node)
+            if body_first is not None:
+                ctx.add_edge(header_node, body_first, EdgeType.TRUE_BRANCH, "true")
                 # Loop back edges
                 for last in body_last:
-                    self._add_edge(last, header_node, EdgeType.LOOP_BACK)
+                    ctx.add_edge(last, header_node, EdgeType.LOOP_BACK)
+        ctx.exit_loop()
+
+        for node in continues:
+            ctx.add_edge(node, header_node, EdgeType.LOOP_BACK)
 
-        return header_node, [header_node]
+        return header_node, [header_node, *breaks]
 
     def _build_do_while_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for do-while loop."""
         # Body entry node
-        body_entry = self._create_node(
+        body_entry = ctx.create_node(
             NodeType.STATEMENT,
             "do",
             stmt.line_number,
         )
 
         # Condition node
-        condition_node = self._create_node(
+        condition_node = ctx.create_node(
             NodeType.LOOP_HEADER,
             f"while ({stmt.metadata.get('condition', '')})",
             stmt.line_number,
@@ -319,27 +432,33 @@ class CFGBuilder:
         )
 
         # Build body
+        breaks, continues = ctx.enter_loop()
         if stmt.children:
-            body_first, body_last = self._build_cfg_for_statements(stmt.children, exit_node)
-            if body_first:
-                self._add_edge(body_entry, body_first, EdgeType.SEQUENTIAL)
+            body_first, body_last = self._build_cfg_for_statements(ctx, stmt.children, exit_node)
+            if body_first is not None:
+                ctx.add_edge(body_entry, body_first, EdgeType.SEQUENTIAL)
                 for last in body_last:
-                    self._add_edge(last, condition_node, EdgeType.SEQUENTIAL)
+                    ctx.add_edge(last, condition_node, EdgeType.SEQUENTIAL)
             else:
-                self._add_edge(body_entry, condition_node, EdgeType.SEQUENTIAL)
+                ctx.add_edge(body_entry, condition_node, EdgeType.SEQUENTIAL)
         else:
-            self._add_edge(body_entry, condition_node, EdgeType.SEQUENTIAL)
+            ctx.add_edge(body_entry, condition_node, EdgeType.SEQUENTIAL)
+        ctx.exit_loop()
+
+        # A continue jumps to the condition check
+        for node in continues:
+            ctx.add_edge(node, condition_node, EdgeType.SEQUENTIAL)
 
         # Loop back from condition
-        self._add_edge(condition_node, body_entry, EdgeType.LOOP_BACK, "true")
+        ctx.add_edge(condition_node, body_entry, EdgeType.LOOP_BACK, "true")
 
-        return body_entry, [condition_node]
+        return body_entry, [condition_node, *breaks]
 
     def _build_switch_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for switch statement."""
-        switch_node = self._create_node(
+        switch_node = ctx.create_node(
             NodeType.SWITCH,
             stmt.code,
             stmt.line_number,
@@ -349,90 +468,103 @@ class CFGBuilder:
             stmt.metadata,
         )
 
-        terminal_nodes: list[GraphNode] = []
+        terminal_nodes: list[int] = []
+
+        # Breaks leave the switch; a continue belongs to the enclosing loop
+        breaks: list[int] = []
+        ctx.break_frames.append(breaks)
 
         for case_stmt in stmt.children:
-            case_node = self._create_node(
-                NodeType.CASE if case_stmt.statement_type == "CASE" else NodeType.CASE,
-                case_stmt.code,
+            case_code = case_stmt.code
+            case_children = case_stmt.children
+
+            case_node = ctx.create_node(
+                NodeType.CASE,
+                case_code,
                 case_stmt.line_number,
                 case_stmt.column,
             )
 
-            edge_type = EdgeType.DEFAULT_BRANCH if case_stmt.statement_type == "DEFAULT" else EdgeType.CASE_BRANCH
-            self._add_edge(switch_node, case_node, edge_type, case_stmt.code)
+            edge_type = _CASE_EDGE_TYPES.get(case_stmt.statement_type, EdgeType.CASE_BRANCH)
+            ctx.add_edge(switch_node, case_node, edge_type, case_code)
 
-            if case_stmt.children:
-                case_first, case_last = self._build_cfg_for_statements(case_stmt.children, exit_node)
-                if case_first:
-                    self._add_edge(case_node, case_first, EdgeType.SEQUENTIAL)
+            if case_children:
+                case_first, case_last = self._build_cfg_for_statements(ctx, case_children, exit_node)
+                if case_first is not None:
+                    ctx.add_edge(case_node, case_first, EdgeType.SEQUENTIAL)
                     terminal_nodes.extend(case_last)
                 else:
                     terminal_nodes.append(case_node)
             else:
                 terminal_nodes.append(case_node)
 
+        ctx.break_frames.pop()
+        terminal_nodes.extend(breaks)
+
         return switch_node, terminal_nodes
 
     def _build_try_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for try-catch-finally."""
-        try_node = self._create_node(
+        try_node = ctx.create_node(
             NodeType.TRY,
             stmt.code,
             stmt.line_number,
             stmt.column,
         )
 
-        terminal_nodes: list[GraphNode] = []
-        finally_node: GraphNode | None = None
+        terminal_nodes: list[int] = []
+        finally_node: int | None = None
 
         for child in stmt.children:
-            if child.statement_type == "TRY_BLOCK":
-                if child.children:
-                    try_first, try_last = self._build_cfg_for_statements(child.children, exit_node)
-                    if try_first:
-                        self._add_edge(try_node, try_first, EdgeType.SEQUENTIAL)
+            child_type = child.statement_type
+            grandchildren = child.children
+
+            if child_type == "TRY_BLOCK":
+                if grandchildren:
+                    try_first, try_last = self._build_cfg_for_statements(ctx, grandchildren, exit_node)
+                    if try_first is not None:
+                        ctx.add_edge(try_node, try_first, EdgeType.SEQUENTIAL)
                         terminal_nodes.extend(try_last)
 
-            elif child.statement_type == "CATCH":
-                catch_node = self._create_node(
+            elif child_type == "CATCH":
+                catch_node = ctx.create_node(
                     NodeType.CATCH,
                     child.code,
                     child.line_number,
                     child.column,
                     child.variables_defined,
                 )
-                self._add_edge(try_node, catch_node, EdgeType.EXCEPTION)
+                ctx.add_edge(try_node, catch_node, EdgeType.EXCEPTION)
 
-                if child.children:
-                    catch_first, catch_last = self._build_cfg_for_statements(child.children, exit_node)
-                    if catch_first:
-                        self._add_edge(catch_node, catch_first, EdgeType.SEQUENTIAL)
+                if grandchildren:
+                    catch_first, catch_last = self._build_cfg_for_statements(ctx, grandchildren, exit_node)
+                    if catch_first is not None:
+                        ctx.add_edge(catch_node, catch_first, EdgeType.SEQUENTIAL)
                         terminal_nodes.extend(catch_last)
                     else:
                         terminal_nodes.append(catch_node)
                 else:
                     terminal_nodes.append(catch_node)
 
-            elif child.statement_type == "FINALLY":
-                finally_node = self._create_node(
+            elif child_type == "FINALLY":
+                finally_node = ctx.create_node(
                     NodeType.FINALLY,
                     "finally",
                     child.line_number,
                 )
-                if child.children:
-                    finally_first, finally_last = self._build_cfg_for_statements(child.children, exit_node)
-                    if finally_first:
-                        self._add_edge(finally_node, finally_first, EdgeType.SEQUENTIAL)
+                if grandchildren:
+                    finally_first, finally_last = self._build_cfg_for_statements(ctx, grandchildren, exit_node)
+                    if finally_first is not None:
+                        ctx.add_edge(finally_node, finally_first, EdgeType.SEQUENTIAL)
                         # Connect all terminals to finally
                         for term in terminal_nodes:
-                            self._add_edge(term, finally_node, EdgeType.FINALLY_EDGE)
+                            ctx.add_edge(term, finally_node, EdgeType.FINALLY_EDGE)
                         terminal_nodes = finally_last
                     else:
                         for term in terminal_nodes:
-                            self._add_edge(term, finally_node, EdgeType.FINALLY_EDGE)
+                            ctx.add_edge(term, finally_node, EdgeType.FINALLY_EDGE)
                         terminal_nodes = [finally_node]
 
         if not terminal_nodes:
@@ -441,10 +573,10 @@ class CFGBuilder:
         return try_node, terminal_nodes
 
     def _build_return_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for return statement."""
-        return_node = self._create_node(
+        return_node = ctx.create_node(
             NodeType.RETURN,
             stmt.code,
             stmt.line_number,
@@ -453,14 +585,14 @@ class CFGBuilder:
             stmt.variables_used,
         )
         # Return directly connects to exit
-        self._add_edge(return_node, exit_node, EdgeType.RETURN_EDGE)
+        ctx.add_edge(return_node, exit_node, EdgeType.RETURN_EDGE)
         return return_node, []  # No successor nodes
 
     def _build_throw_cfg(
-        self, stmt: ParsedStatement, exit_node: GraphNode
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement, exit_node: int
+    ) -> tuple[int, list[int]]:
         """Build CFG for throw statement."""
-        throw_node = self._create_node(
+        throw_node = ctx.create_node(
             NodeType.THROW,
             stmt.code,
             stmt.line_number,
@@ -469,30 +601,34 @@ class CFGBuilder:
             stmt.variables_used,
         )
         # Throw connects to exit (exception path)
-        self._add_edge(throw_node, exit_node, EdgeType.EXCEPTION)
+        ctx.add_edge(throw_node, exit_node, EdgeType.EXCEPTION)
         return throw_node, []  # No normal successor
 
     def _build_jump_cfg(
-        self, stmt: ParsedStatement
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement
+    ) -> tuple[int, list[int]]:
         """Build CFG for break/continue."""
-        node_type = NodeType.BREAK if stmt.statement_type == "BREAK" else NodeType.CONTINUE
-        jump_node = self._create_node(
-            node_type,
+        is_break = stmt.statement_type == "BREAK"
+        jump_node = ctx.create_node(
+            NodeType.BREAK if is_break else NodeType.CONTINUE,
             stmt.code,
             stmt.line_number,
             stmt.column,
         )
-        # Break/continue need special handling in loop context
+
+        # The enclosing loop or switch adds the jump's edge once it is built;
+        # there is no fall-through successor either way
+        frames = ctx.break_frames if is_break else ctx.continue_frames
+        if frames:
+            frames[-1].append(jump_node)
         return jump_node, []
 
     def _build_simple_statement_cfg(
-        self, stmt: ParsedStatement
-    ) -> tuple[GraphNode, list[GraphNode]]:
+        self, ctx: _BuildContext, stmt: ParsedStatement
+    ) -> tuple[int, list[int]]:
         """Build CFG for simple statements."""
-        node_type = self._map_statement_type(stmt.statement_type)
-        node = self._create_node(
-            node_type,
+        node = ctx.create_node(
+            _STMT_TO_NODE.get(stmt.statement_type, NodeType.STATEMENT),
             stmt.code,
             stmt.line_number,
             stmt.column,
@@ -502,108 +638,13 @@ class CFGBuilder:
         )
         return node, [node]
 
-    def _map_statement_type(self, stmt_type: str) -> NodeType:
-        """Map statement type string to NodeType enum."""
-        mapping = {
-            "ASSIGNMENT": NodeType.ASSIGNMENT,
-            "DECLARATION": NodeType.DECLARATION,
-            "METHOD_CALL": NodeType.METHOD_CALL,
-            "EXPRESSION": NodeType.STATEMENT,
-            "STATEMENT": NodeType.STATEMENT,
-        }
-        return mapping.get(stmt_type, NodeType.STATEMENT)
-
-    def _reset(self) -> None:
-        """Reset builder state."""
-        self._node_counter = 0
-        self._graph = nx.DiGraph()
-
-    def _create_node(
-        self,
-        node_type: NodeType,
-        code: str,
-        line: int | None,
-        column: int | None = None,
-        vars_defined: list[str] | None = None,
-        vars_used: list[str] | None = None,
-        metadata: dict[str, Any] | None = None,
-    ) -> GraphNode:
-        """Create a new graph node."""
-        node_id = f"n{self._node_counter}"
-        self._node_counter += 1
-
-        node = GraphNode(
-            id=node_id,
-            type=node_type,
-            code=code,
-            line_number=line,
-            column=column,
-            variables_defined=vars_defined or [],
-            variables_used=vars_used or [],
-            metadata=metadata or {},
-        )
-
-        self._graph.add_node(
-            node_id,
-            type=node_type.value,
-            code=code,
-            line=line,
-            vars_def=vars_defined or [],
-            vars_use=vars_used or [],
-        )
-
-        return node
-
-    def _add_edge(
-        self,
-        source: GraphNode,
-        target: GraphNode,
-        edge_type: EdgeType,
-        label: str = "",
-    ) -> GraphEdge:
-        """Add an edge between two nodes."""
-        edge = GraphEdge(
-            source=source.id,
-            target=target.id,
-            type=edge_type,
-            label=label,
-        )
+    def _materialize_graph(self, nodes: list[GraphNode], edges: list[GraphEdge]) -> nx.DiGraph:
+        """Build the NetworkX view of the finished CFG in one bulk pass.
 
-        self._graph.add_edge(
-            source.id,
-            target.id,
-            type=edge_type.value,
-            label=label,
-        )
-
-        return edge
-
-    def _get_all_nodes(self) -> list[GraphNode]:
-        """Get all nodes from the graph."""
-        nodes = []
-        for node_id in self._graph.nodes():
-            data = self._graph.nodes[node_id]
-            node = GraphNode(
-                id=node_id,
-                type=NodeType(data.get("type", "STATEMENT")),
-                code=data.get("code", ""),
-                line_number=data.get("line"),
-                column=data.get("column"),
-                variables_defined=data.get("vars_def", []),
-                variables_used=data.get("vars_use", []),
-            )
-            nodes.append(node)
-        return nodes
-
-    def _get_all_edges(self) -> list[GraphEdge]:
-        """Get all edges from the graph."""
-        edges = []
-        for source, target, data in self._graph.edges(data=True):
-            edge = GraphEdge(
-                source=source,
-                target=target,
-                type=EdgeType(data.get("type", "SEQUENTIAL")),
-                label=data.get("label", ""),
-            )
-            edges.append(edge)
-        return edges
+        Construction only appends to plain lists and dicts; the DiGraph is
+        built once at the end and only carries structure plus edge types.
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(node.id for node in nodes)
+        graph.add_edges_from((edge.source, edge.target, {"type": edge.type}) for edge in edges)
+        return graph
@@ -1,5 +1,7 @@
 """Data Dependence Graph builder using def-use chain analysis."""
 
+from bisect import bisect_right
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -10,12 +12,35 @@ from app.services.java_parser import ParsedMethod, ParsedStatement, ParsedClass
 from app.core.exceptions import DDGBuildError
 
 
+# Node type of each statement type; anything else is a plain STATEMENT
+_STMT_TYPE_MAP: dict[str, NodeType] = {
+    "IF": NodeType.CONDITION,
+    "WHILE": NodeType.LOOP_HEADER,
+    "FOR": NodeType.LOOP_HEADER,
+    "DO_WHILE": NodeType.LOOP_HEADER,
+    "SWITCH": NodeType.SWITCH,
+    "CASE": NodeType.CASE,
+    "DEFAULT": NodeType.CASE,
+    "TRY": NodeType.TRY,
+    "TRY_BLOCK": NodeType.TRY,
+    "CATCH": NodeType.CATCH,
+    "FINALLY": NodeType.FINALLY,
+    "RETURN": NodeType.RETURN,
+    "THROW": NodeType.THROW,
+    "BREAK": NodeType.BREAK,
+    "CONTINUE": NodeType.CONTINUE,
+    "ASSIGNMENT": NodeType.ASSIGNMENT,
+    "DECLARATION": NodeType.DECLARATION,
+    "METHOD_CALL": NodeType.METHOD_CALL,
+}
+
+
 @dataclass
 class VariableDefinition:
     """Represents a variable definition point."""
 
     variable: str
-    node_id: str
+    node_id: int
     line: int | None
     is_parameter: bool = False
 
@@ -25,7 +50,7 @@ class VariableUse:
     """Represents a variable use point."""
 
     variable: str
-    node_id: str
+    node_id: int
     line: int | None
 
 
@@ -39,15 +64,23 @@ class DefUseChain:
 
 
 class DDGBuilder:
-    """Builds Data Dependence Graphs using def-use chain analysis."""
+    """Builds Data Dependence Graphs using def-use chain analysis.
+
+    Nodes are referred to internally by their index in ``_nodes``; the
+    string ids (``"d0"``, ``"d1"``, ...) only appear on the returned nodes,
+    edges and graph.
+    """
 
     def __init__(self) -> None:
-        self._node_counter: int = 0
         self._graph: nx.DiGraph = nx.DiGraph()
-        self._definitions: dict[str, list[VariableDefinition]] = {}
-        self._uses: dict[str, list[VariableUse]] = {}
-        self._node_map: dict[str, GraphNode] = {}
+        self._definitions: defaultdict[str, list[VariableDefinition]] = defaultdict(list)
+        self._uses: defaultdict[str, list[VariableUse]] = defaultdict(list)
+        self._nodes: list[GraphNode] = []
         self._reaching_definitions: dict[str, dict[str, set[str]]] = {}
+        # Nodes live in _nodes and edges here as (source, target) ->
+        # (edge type, variables) until both are flushed to the graph at once
+        # Variables per edge kept as insertion-ordered dict keys (an ordered set)
+        self._edge_vars: dict[tuple[int, int], tuple[EdgeType, dict[str, None]]] = {}
 
     def build_method_ddg(
         self, method: ParsedMethod, cfg_nodes: list[GraphNode]
@@ -73,13 +106,14 @@ class DDGBuilder:
 
         # Register parameter definitions
         for param in method.parameters:
-            self._register_definition(param, entry_node.id, method.line_start, is_parameter=True)
+            self._register_definition(param, entry_node, method.line_start, is_parameter=True)
 
         # Process all statements to collect defs and uses
         self._process_statements(method.statements)
 
         # Build def-use edges
         self._build_def_use_edges()
+        self._flush_graph()
 
         nodes = self._get_all_nodes()
         edges = self._get_all_edges()
@@ -109,7 +143,7 @@ class DDGBuilder:
                 vars_defined=parsed_class.fields.copy(),
             )
             for field_name in parsed_class.fields:
-                self._register_definition(field_name, fields_node.id, parsed_class.line_start)
+                self._register_definition(field_name, fields_node, parsed_class.line_start)
 
         # Process each method
         for method in parsed_class.methods:
@@ -122,13 +156,14 @@ class DDGBuilder:
             )
 
             for param in method.parameters:
-                self._register_definition(param, method_entry.id, method.line_start, is_parameter=True)
+                self._register_definition(param, method_entry, method.line_start, is_parameter=True)
 
             # Process method statements
             self._process_statements(method.statements)
 
         # Build def-use edges
         self._build_def_use_edges()
+        self._flush_graph()
 
         nodes = self._get_all_nodes()
         edges = self._get_all_edges()
@@ -136,12 +171,19 @@ class DDGBuilder:
         return self._graph, nodes, edges
 
     def _process_statements(self, statements: list[ParsedStatement]) -> None:
-        """Process statements to extract definitions and uses."""
-        for stmt in statements:
+        """Process statements and everything nested in them to extract definitions and uses.
+
+        Walks the statement tree in pre-order with an explicit stack, so deep
+        nesting costs no Python frames.
+        """
+        stack = statements[::-1]
+        while stack:
+            stmt = stack.pop()
             self._process_statement(stmt)
+            stack.extend(reversed(stmt.children))
 
     def _process_statement(self, stmt: ParsedStatement) -> None:
-        """Process a single statement."""
+        """Process a single statement (not its children)."""
         # Create node for this statement
         node = self._create_node(
             self._map_statement_type(stmt.statement_type),
@@ -154,18 +196,14 @@ class DDGBuilder:
 
         # Register definitions
         for var in stmt.variables_defined:
-            self._register_definition(var, node.id, stmt.line_number)
+            self._register_definition(var, node, stmt.line_number)
 
         # Register uses
         for var in stmt.variables_used:
-            self._register_use(var, node.id, stmt.line_number)
-
-        # Process children recursively
-        for child in stmt.children:
-            self._process_statement(child)
+            self._register_use(var, node, stmt.line_number)
 
     def _register_definition(
-        self, variable: str, node_id: str, line: int | None, is_parameter: bool = False
+        self, variable: str, node_id: int, line: int | None, is_parameter: bool = False
     ) -> None:
         """Register a variable definition."""
         definition = VariableDefinition(
@@ -175,11 +213,9 @@ class DDGBuilder:
             is_parameter=is_parameter,
         )
 
-        if variable not in self._definitions:
-            self._definitions[variable] = []
         self._definitions[variable].append(definition)
 
-    def _register_use(self, variable: str, node_id: str, line: int | None) -> None:
+    def _register_use(self, variable: str, node_id: int, line: int | None) -> None:
         """Register a variable use."""
         use = VariableUse(
             variable=variable,
@@ -187,8 +223,6 @@ class DDGBuilder:
             line=line,
         )
 
-        if variable not in self._uses:
-            self._uses[variable] = []
         self._uses[variable].append(use)
 
     def _build_def_use_edges(self) -> None:
@@ -198,10 +232,24 @@ class DDGBuilder:
                 continue
 
             definitions = self._definitions[variable]
+            if len(definitions) == 1:
+                # A lone definition (typically a parameter that is never
+                # reassigned) reaches every use that does not precede it
+                defn = definitions[0]
+                for use in uses:
+                    if defn.line is None or use.line is None or defn.line <= use.line:
+                        self._add_edge(defn.node_id, use.node_id, EdgeType.DATA_DEP, variable)
+                continue
+
+            prefix_table = self._reaching_prefix_table(definitions)
 
             for use in uses:
                 # Find the most recent definition before this use
-                reaching_def = self._find_reaching_definition(variable, use, definitions)
+                if prefix_table is not None and use.line is not None:
+                    lines, reaching_after = prefix_table
+                    reaching_def = reaching_after[bisect_right(lines, use.line)]
+                else:
+                    reaching_def = self._find_reaching_definition(variable, use, definitions)
 
                 if reaching_def:
                     self._add_edge(
@@ -233,15 +281,51 @@ class DDGBuilder:
                 continue
 
             if defn.line <= use.line:
-                # Parameters always reach (unless overwritten)
-                if defn.is_parameter:
-                    if reaching is None or not reaching.is_parameter:
-                        reaching = defn
-                elif reaching is None or (reaching.line is not None and defn.line > reaching.line):
-                    reaching = defn
+                reaching = self._advance_reaching(reaching, defn)
+
+        return reaching
 
+    @staticmethod
+    def _advance_reaching(
+        reaching: VariableDefinition | None, defn: VariableDefinition
+    ) -> VariableDefinition | None:
+        """Update the reaching definition with a later definition that precedes the use."""
+        # Parameters always reach (unless overwritten)
+        if defn.is_parameter:
+            if reaching is None or not reaching.is_parameter:
+                return defn
+        elif reaching is None or (reaching.line is not None and defn.line > reaching.line):
+            return defn
         return reaching
 
+    def _reaching_prefix_table(
+        self, definitions: list[VariableDefinition]
+    ) -> tuple[list[int], list[VariableDefinition | None]] | None:
+        """Precompute reaching definitions for binary search by use line.
+
+        Definitions are registered in traversal order, so their lines almost
+        always ascend; then the definitions preceding a use are a prefix of
+        the list. Entry ``k`` of the returned list is the result of
+        ``_find_reaching_definition`` for any use that sees the first ``k``
+        definitions, found with ``bisect_right`` on the returned lines.
+
+        Returns:
+            Tuple of (definition lines, reaching definition per prefix length),
+            or None when a line is missing or out of order.
+        """
+        lines: list[int] = []
+        reaching_after: list[VariableDefinition | None] = [None]
+        reaching: VariableDefinition | None = None
+
+        for defn in definitions:
+            if defn.line is None or (lines and defn.line < lines[-1]):
+                return None
+            lines.append(defn.line)
+            reaching = self._advance_reaching(reaching, defn)
+            reaching_after.append(reaching)
+
+        return lines, reaching_after
+
     def _build_use_def_edges(self) -> None:
         """Build edges from uses to their next definitions (anti-dependence)."""
         for variable, definitions in self._definitions.items():
@@ -272,36 +356,16 @@ class DDGBuilder:
 
     def _map_statement_type(self, stmt_type: str) -> NodeType:
         """Map statement type string to NodeType enum."""
-        mapping = {
-            "IF": NodeType.CONDITION,
-            "WHILE": NodeType.LOOP_HEADER,
-            "FOR": NodeType.LOOP_HEADER,
-            "DO_WHILE": NodeType.LOOP_HEADER,
-            "SWITCH": NodeType.SWITCH,
-            "CASE": NodeType.CASE,
-            "DEFAULT": NodeType.CASE,
-            "TRY": NodeType.TRY,
-            "TRY_BLOCK": NodeType.TRY,
-            "CATCH": NodeType.CATCH,
-            "FINALLY": NodeType.FINALLY,
-            "RETURN": NodeType.RETURN,
-            "THROW": NodeType.THROW,
-            "BREAK": NodeType.BREAK,
-            "CONTINUE": NodeType.CONTINUE,
-            "ASSIGNMENT": NodeType.ASSIGNMENT,
-            "DECLARATION": NodeType.DECLARATION,
-            "METHOD_CALL": NodeType.METHOD_CALL,
-        }
-        return mapping.get(stmt_type, NodeType.STATEMENT)
+        return _STMT_TYPE_MAP.get(stmt_type, NodeType.STATEMENT)
 
     def _reset(self) -> None:
         """Reset builder state."""
-        self._node_counter = 0
         self._graph = nx.DiGraph()
-        self._definitions = {}
-        self._uses = {}
-        self._node_map = {}
+        self._definitions = defaultdict(list)
+        self._uses = defaultdict(list)
+        self._nodes = []
         self._reaching_definitions = {}
+        self._edge_vars = {}
 
     def _create_node(
         self,
@@ -312,13 +376,12 @@ class DDGBuilder:
         vars_defined: list[str] | None = None,
         vars_used: list[str] | None = None,
         metadata: dict[str, Any] | None = None,
-    ) -> GraphNode:
-        """Create a new graph node."""
-        node_id = f"d{self._node_counter}"
-        self._node_counter += 1
+    ) -> int:
+        """Create a new graph node and return its index."""
+        index = len(self._nodes)
 
-        node = GraphNode(
-            id=node_id,
+        node = GraphNode.construct(
+            id=f"d{index}",
             type=node_type,
             code=code,
             line_number=line,
@@ -328,74 +391,69 @@ class DDGBuilder:
             metadata=metadata or {},
         )
 
-        self._graph.add_node(
-            node_id,
-            type=node_type.value,
-            code=code,
-            line=line,
-            vars_def=vars_defined or [],
-            vars_use=vars_used or [],
-        )
-
-        self._node_map[node_id] = node
-        return node
+        self._nodes.append(node)
+        return index
 
     def _add_edge(
         self,
-        source_id: str,
-        target_id: str,
+        source_id: int,
+        target_id: int,
         edge_type: EdgeType,
         variable: str,
-    ) -> GraphEdge:
-        """Add a data dependence edge."""
+    ) -> None:
+        """Record a data dependence edge; repeats only add their variable."""
         # Avoid self-loops and duplicate edges
         if source_id == target_id:
-            return GraphEdge(source=source_id, target=target_id, type=edge_type, variable=variable)
-
-        if self._graph.has_edge(source_id, target_id):
-            # Check if edge with same variable already exists
-            existing = self._graph.edges[source_id, target_id]
-            existing_vars = existing.get("variables", [])
-            if variable not in existing_vars:
-                existing_vars.append(variable)
-                self._graph.edges[source_id, target_id]["variables"] = existing_vars
-            return GraphEdge(source=source_id, target=target_id, type=edge_type, variable=variable)
-
-        edge = GraphEdge(
-            source=source_id,
-            target=target_id,
-            type=edge_type,
-            variable=variable,
-            label=f"dep:{variable}",
+            return
+
+        key = (source_id, target_id)
+        existing = self._edge_vars.get(key)
+        if existing is None:
+            self._edge_vars[key] = (edge_type, {variable: None})
+        else:
+            existing[1][variable] = None
+
+    def _flush_graph(self) -> None:
+        """Add the recorded nodes and edges to the graph in two bulk calls."""
+        self._graph.add_nodes_from(
+            (
+                node.id,
+                {
+                    "type": node.type,
+                    "code": node.code,
+                    "line": node.line_number,
+                    "vars_def": node.variables_defined,
+                    "vars_use": node.variables_used,
+                },
+            )
+            for node in self._nodes
+        )
+        # Each edge is labelled with its first variable
+        ids = [node.id for node in self._nodes]
+        self._graph.add_edges_from(
+            self._edge_attrs(ids[source], ids[target], edge_type, list(variables))
+            for (source, target), (edge_type, variables) in self._edge_vars.items()
         )
 
-        self._graph.add_edge(
+    @staticmethod
+    def _edge_attrs(
+        source_id: str, target_id: str, edge_type: EdgeType, variables: list[str]
+    ) -> tuple[str, str, dict[str, Any]]:
+        """Build the NetworkX edge tuple for a recorded dependence."""
+        return (
             source_id,
             target_id,
-            type=edge_type.value,
-            variable=variable,
-            variables=[variable],
-            label=f"dep:{variable}",
+            {
+                "type": edge_type,
+                "variable": variables[0],
+                "variables": variables,
+                "label": f"dep:{variables[0]}",
+            },
         )
 
-        return edge
-
     def _get_all_nodes(self) -> list[GraphNode]:
-        """Get all nodes from the graph."""
-        nodes = []
-        for node_id in self._graph.nodes():
-            data = self._graph.nodes[node_id]
-            node = GraphNode(
-                id=node_id,
-                type=NodeType(data.get("type", "STATEMENT")),
-                code=data.get("code", ""),
-                line_number=data.get("line"),
-                column=data.get("column"),
-                variables_defined=data.get("vars_def", []),
-                variables_used=data.get("vars_use", []),
-            )
-            nodes.append(node)
-        return nodes
+        """Get all nodes in creation order."""
+        return list(self._nodes)
 
     def _get_all_edges(self) -> list[GraphEdge]:
         """Get all edges from the graph."""
@@ -404,10 +462,10 @@ class DDGBuilder:
             # Create an edge for each variable dependency
             variables = data.get("variables", [data.get("variable", "")])
             for var in variables:
-                edge = GraphEdge(
+                edge = GraphEdge.construct(
                     source=source,
                     target=target,
-                    type=EdgeType(data.get("type", "DATA_DEP")),
+                    type=data.get("type", EdgeType.DATA_DEP),
                     variable=var,
                     label=f"dep:{var}",
                 )
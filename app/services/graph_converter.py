@@ -1,12 +1,20 @@
 """Graph format converters for transformer model input."""
 
-from collections import deque
+import re
+from collections.abc import Callable, Collection, Iterable
+from functools import lru_cache
 from typing import Any
 
 import networkx as nx
 import numpy as np
 
 from app.models.graph_models import (
+    ALL_GRAPH_FORMATS,
+    EDGE_TYPE_NAMES,
+    NODE_TYPE_NAMES,
+    EdgeType,
+    EdgeTable,
+    NodeTable,
     GraphNode,
     GraphEdge,
     GraphOutput,
@@ -15,6 +23,107 @@ from app.models.graph_models import (
     SequenceFormat,
 )
 
+# Code tokens: a single special character, or a run of anything else but whitespace
+_SPECIAL_CHARS = r"(){}\[\];,.<>=+\-*/%&|!?:"
+_TOKEN_RE = re.compile(rf"[{_SPECIAL_CHARS}]|[^\s{_SPECIAL_CHARS}]+")
+_MAX_CODE_TOKENS = 50
+
+# Adjacency matrices of at least this many nodes with under 1 / divisor of
+# their cells set are emitted in COO form instead of dense
+_SPARSE_MIN_NODES = 256
+_SPARSE_DENSITY_DIVISOR = 8
+
+
+def _dfs_order(indptr: np.ndarray, indices: np.ndarray, roots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Iterative preorder DFS over a CSR graph, visiting successors in order.
+
+    Args:
+        indptr: Row offsets (int32, length n + 1).
+        indices: Successor rows (int32), grouped by source row.
+        roots: Rows to start traversals from, in order.
+
+    Returns:
+        Tuple of (visited rows in preorder, position in ``indices`` of the
+        edge each row was reached through, or -1 for traversal roots).
+    """
+    n = indptr.shape[0] - 1
+    order = np.empty(n, dtype=np.int32)
+    via = np.empty(n, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.bool_)
+    stack_node = np.empty(n, dtype=np.int32)
+    stack_next = np.empty(n, dtype=np.int32)
+    count = 0
+
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = True
+        order[count] = root
+        via[count] = -1
+        count += 1
+
+        depth = 0
+        stack_node[0] = root
+        stack_next[0] = indptr[root]
+        while depth >= 0:
+            node = stack_node[depth]
+            pos = stack_next[depth]
+            if pos == indptr[node + 1]:
+                depth -= 1
+                continue
+            stack_next[depth] = pos + 1
+
+            successor = indices[pos]
+            if not visited[successor]:
+                visited[successor] = True
+                order[count] = successor
+                via[count] = pos
+                count += 1
+
+                depth += 1
+                stack_node[depth] = successor
+                stack_next[depth] = indptr[successor]
+
+    return order[:count], via[:count]
+
+
+@lru_cache(maxsize=1)
+def _dfs_kernel() -> Callable[..., tuple[np.ndarray, np.ndarray]]:
+    """Compile ``_dfs_order`` with Numba on first use.
+
+    numba is imported here rather than at module level because only the
+    graph-building worker processes run the kernel.
+    """
+    from numba import njit
+
+    return njit(cache=True)(_dfs_order)
+
+
+def warm_up_kernels() -> None:
+    """Compile (or load from cache) the traversal kernel on a toy graph."""
+    _dfs_kernel()(
+        np.array([0, 1, 1], dtype=np.int32),
+        np.array([1], dtype=np.int32),
+        np.array([0], dtype=np.int32),
+    )
+
+
+def _edge_list_table(edge_list: EdgeListFormat) -> EdgeTable:
+    """Get the edges of an edge list as rows into its node list."""
+    node_id_to_idx = {node.id: idx for idx, node in enumerate(edge_list.nodes)}
+    return EdgeTable.from_edges(edge_list.edges, node_id_to_idx)
+
+
+def _build_vocab(items: Iterable[str]) -> tuple[list[int], dict[str, int]]:
+    """Number distinct items in order of first appearance.
+
+    Returns:
+        Tuple of (id of every item, item -> id vocabulary).
+    """
+    vocab: dict[str, int] = {}
+    ids = [vocab.setdefault(item, len(vocab)) for item in items]
+    return ids, vocab
+
 
 class GraphConverter:
     """Converts graphs to various formats suitable for transformer models."""
@@ -24,26 +133,36 @@ class GraphConverter:
         graph: nx.DiGraph,
         nodes: list[GraphNode],
         edges: list[GraphEdge],
+        formats: Collection[str] = ALL_GRAPH_FORMATS,
     ) -> GraphOutput:
-        """Convert a graph to all output formats.
+        """Convert a graph to the requested output formats.
 
         Args:
             graph: NetworkX directed graph.
             nodes: List of graph nodes.
             edges: List of graph edges.
+            formats: Formats to build ("edge_list", "adjacency_matrix",
+                "sequence"). Formats not listed are left empty.
 
         Returns:
-            GraphOutput containing all format representations.
+            GraphOutput containing the requested format representations.
         """
-        edge_list = self._to_edge_list(nodes, edges)
-        adjacency_matrix = self._to_adjacency_matrix(graph, nodes, edges)
-        sequence = self._to_sequence(graph, nodes)
-
-        return GraphOutput(
-            edge_list=edge_list,
-            adjacency_matrix=adjacency_matrix,
-            sequence=sequence,
-        )
+        edge_list = self._to_edge_list(nodes, edges) if "edge_list" in formats else EdgeListFormat()
+        adjacency_matrix = AdjacencyMatrixFormat()
+        sequence = SequenceFormat()
+
+        if "adjacency_matrix" in formats or "sequence" in formats:
+            # Columnar views shared by the matrix and sequence conversions
+            node_table = NodeTable.from_nodes(nodes)
+
+            if "adjacency_matrix" in formats:
+                edge_table = EdgeTable.from_edges(edges, node_table.index)
+                adjacency_matrix = self._to_adjacency_matrix(node_table, edge_table)
+
+            if "sequence" in formats:
+                sequence = self._to_sequence(graph, node_table)
+
+        return GraphOutput(edge_list=edge_list, adjacency_matrix=adjacency_matrix, sequence=sequence)
 
     def _to_edge_list(
         self, nodes: list[GraphNode], edges: list[GraphEdge]
@@ -61,160 +180,149 @@ class GraphConverter:
 
     def _to_adjacency_matrix(
         self,
-        graph: nx.DiGraph,
-        nodes: list[GraphNode],
-        edges: list[GraphEdge],
+        nodes: NodeTable,
+        edges: EdgeTable,
     ) -> AdjacencyMatrixFormat:
         """Convert to adjacency matrix format.
 
-        Creates a dense adjacency matrix with node ID mappings.
+        Creates a dense int8 adjacency matrix and a parallel int16 matrix of
+        edge type codes, filled by scattering the edge columns. Large graphs
+        with few edges per cell get the COO form from ``_to_sparse_adjacency``.
         """
-        if not nodes:
-            return AdjacencyMatrixFormat(
-                matrix=[],
-                node_ids=[],
-                node_types=[],
-                edge_types_matrix=[],
-            )
-
-        # Create node ID to index mapping
-        node_ids = [node.id for node in nodes]
-        node_types = [node.type.value for node in nodes]
-        id_to_idx = {nid: idx for idx, nid in enumerate(node_ids)}
+        if not len(nodes):
+            return AdjacencyMatrixFormat()
 
         n = len(nodes)
+        if n >= _SPARSE_MIN_NODES and len(edges) * _SPARSE_DENSITY_DIVISOR < n * n:
+            return self._to_sparse_adjacency(nodes, edges)
 
-        # Initialize matrices
-        adjacency = [[0] * n for _ in range(n)]
-        edge_types: list[list[str | None]] = [[None] * n for _ in range(n)]
+        adjacency = np.zeros((n, n), dtype=np.int8)
+        adjacency[edges.src, edges.dst] = 1
 
-        # Fill matrices from edges
-        for edge in edges:
-            if edge.source in id_to_idx and edge.target in id_to_idx:
-                src_idx = id_to_idx[edge.source]
-                tgt_idx = id_to_idx[edge.target]
-                adjacency[src_idx][tgt_idx] = 1
-                edge_types[src_idx][tgt_idx] = edge.type.value
+        edge_type_codes = np.full((n, n), -1, dtype=np.int16)
+        edge_type_codes[edges.src, edges.dst] = edges.types
 
         return AdjacencyMatrixFormat(
             matrix=adjacency,
-            node_ids=node_ids,
-            node_types=node_types,
-            edge_types_matrix=edge_types,
+            node_ids=nodes.ids,
+            node_types=[NODE_TYPE_NAMES[code] for code in nodes.types.tolist()],
+            edge_type_codes=edge_type_codes,
+        )
+
+    def _to_sparse_adjacency(
+        self,
+        nodes: NodeTable,
+        edges: EdgeTable,
+    ) -> AdjacencyMatrixFormat:
+        """Convert to COO adjacency format, listing each edge cell once.
+
+        Cells come in row-major order (the order ``np.nonzero`` gives on the
+        dense matrix) and, like the dense scatter, a cell hit by several
+        edges keeps the type of the last one.
+        """
+        n = len(nodes)
+        cells = edges.src.astype(np.int64) * n + edges.dst
+
+        # First occurrence in the reversed edges is the last one in edge order
+        cells, last = np.unique(cells[::-1], return_index=True)
+        rows, cols = np.divmod(cells, n)
+
+        return AdjacencyMatrixFormat(
+            node_ids=nodes.ids,
+            node_types=[NODE_TYPE_NAMES[code] for code in nodes.types.tolist()],
+            sparse=True,
+            rows=rows.astype(np.int32),
+            cols=cols.astype(np.int32),
+            coo_edge_type_codes=edges.types[::-1][last].astype(np.int16),
         )
 
     def _to_sequence(
-        self, graph: nx.DiGraph, nodes: list[GraphNode]
+        self, graph: nx.DiGraph, nodes: NodeTable
     ) -> SequenceFormat:
         """Convert to sequence format using DFS traversal.
 
         Creates a linearized token sequence suitable for sequence models.
+        The traversal itself runs in the compiled ``_dfs_order`` kernel over
+        a CSR view of the graph; this method only emits tokens.
         """
-        if not nodes:
+        if not len(nodes):
             return SequenceFormat(tokens=[], node_sequence=[], traversal_type="DFS")
 
+        graph_ids = list(graph)
+        graph_index = {node_id: i for i, node_id in enumerate(graph_ids)}
+
+        # CSR adjacency in successor order, with the type of every edge
+        indptr = np.zeros(len(graph_ids) + 1, dtype=np.int32)
+        indices: list[int] = []
+        edge_types: list[int] = []
+        for i, successors in enumerate(graph.adj.values()):
+            for successor, edge_data in successors.items():
+                indices.append(graph_index[successor])
+                edge_types.append(edge_data.get("type", EdgeType.SEQUENTIAL))
+            indptr[i + 1] = len(indices)
+
         # Find entry nodes (nodes with no predecessors)
-        entry_nodes = [n for n in graph.nodes() if graph.in_degree(n) == 0]
+        roots = [i for i, predecessors in enumerate(graph.pred.values()) if not predecessors]
 
-        if not entry_nodes:
+        if not roots and nodes.ids[0] in graph_index:
             # If no entry nodes, start from first node
-            entry_nodes = [nodes[0].id] if nodes else []
+            roots = [graph_index[nodes.ids[0]]]
+
+        order, via = _dfs_kernel()(
+            indptr, np.asarray(indices, dtype=np.int32), np.asarray(roots, dtype=np.int32)
+        )
+
+        # Plain-list copies of the columns read per visited node
+        type_tokens = [f"[{NODE_TYPE_NAMES[code]}]" for code in nodes.types.tolist()]
+        var_def_offsets = nodes.var_def_offsets.tolist()
+        var_use_offsets = nodes.var_use_offsets.tolist()
 
-        # DFS traversal
         tokens: list[str] = []
         node_sequence: list[str] = []
-        visited: set[str] = set()
 
-        node_map = {node.id: node for node in nodes}
+        for node, edge in zip(order.tolist(), via.tolist()):
+            node_id = graph_ids[node]
+            if edge >= 0:
+                # Add token for the edge the traversal arrived through
+                tokens.append(f"[EDGE:{EDGE_TYPE_NAMES[edge_types[edge]]}]")
+            node_sequence.append(node_id)
 
-        for entry in entry_nodes:
-            self._dfs_traverse(graph, entry, node_map, tokens, node_sequence, visited)
-
-        return SequenceFormat(
-            tokens=tokens,
-            node_sequence=node_sequence,
-            traversal_type="DFS",
-        )
+            row = nodes.index.get(node_id)
+            if row is None:
+                continue
 
-    def _dfs_traverse(
-        self,
-        graph: nx.DiGraph,
-        node_id: str,
-        node_map: dict[str, GraphNode],
-        tokens: list[str],
-        node_sequence: list[str],
-        visited: set[str],
-    ) -> None:
-        """Perform DFS traversal and collect tokens."""
-        if node_id in visited:
-            return
-
-        visited.add(node_id)
-        node_sequence.append(node_id)
-
-        # Get node info
-        node = node_map.get(node_id)
-        if node:
             # Add node type token
-            tokens.append(f"[{node.type.value}]")
+            tokens.append(type_tokens[row])
 
             # Add code tokens (simplified tokenization)
-            code_tokens = self._tokenize_code(node.code)
-            tokens.extend(code_tokens)
+            tokens.extend(self._tokenize_code(nodes.codes[row]))
 
             # Add variable tokens
-            for var in node.variables_defined:
+            for var in nodes.var_def_flat[var_def_offsets[row]:var_def_offsets[row + 1]]:
                 tokens.append(f"[DEF:{var}]")
-            for var in node.variables_used:
+            for var in nodes.var_use_flat[var_use_offsets[row]:var_use_offsets[row + 1]]:
                 tokens.append(f"[USE:{var}]")
 
-        # Traverse successors
-        for successor in graph.successors(node_id):
-            if successor not in visited:
-                # Add edge token
-                edge_data = graph.edges.get((node_id, successor), {})
-                edge_type = edge_data.get("type", "SEQUENTIAL")
-                tokens.append(f"[EDGE:{edge_type}]")
-
-                self._dfs_traverse(graph, successor, node_map, tokens, node_sequence, visited)
+        return SequenceFormat(
+            tokens=tokens,
+            node_sequence=node_sequence,
+            traversal_type="DFS",
+        )
 
     def _tokenize_code(self, code: str) -> list[str]:
         """Tokenize code snippet into tokens.
 
-        Simple tokenization for transformer input.
+        Simple tokenization for transformer input: every special character is
+        a token, and runs of any other non-whitespace characters are tokens.
         """
         if not code:
             return []
 
-        # Clean and split code
-        code = code.strip()
-
-        # Simple tokenization: split on whitespace and special characters
-        tokens: list[str] = []
-        current = ""
-
-        special_chars = set("(){}[];,.<>=+-*/%&|!?:")
-
-        for char in code:
-            if char.isspace():
-                if current:
-                    tokens.append(current)
-                    current = ""
-            elif char in special_chars:
-                if current:
-                    tokens.append(current)
-                    current = ""
-                tokens.append(char)
-            else:
-                current += char
-
-        if current:
-            tokens.append(current)
+        tokens = _TOKEN_RE.findall(code)
 
         # Limit tokens for very long code
-        max_tokens = 50
-        if len(tokens) > max_tokens:
-            tokens = tokens[:max_tokens] + ["..."]
+        if len(tokens) > _MAX_CODE_TOKENS:
+            tokens = tokens[:_MAX_CODE_TOKENS] + ["..."]
 
         return tokens
 
@@ -222,67 +330,105 @@ class GraphConverter:
         self,
         graph_output: GraphOutput,
         format_type: str = "edge_list",
+        edge_table: EdgeTable | None = None,
     ) -> dict[str, Any]:
         """Convert graph output to a specific transformer-ready format.
 
         Args:
             graph_output: GraphOutput object.
             format_type: One of "edge_list", "adjacency_matrix", "sequence", or "all".
+            edge_table: Result of ``edge_table(graph_output)``, when the
+                caller already built it for another export.
 
         Returns:
             Dictionary with transformer-ready data.
         """
         if format_type == "edge_list":
-            return self._edge_list_to_transformer(graph_output.edge_list)
+            return self._edge_list_to_transformer(graph_output.edge_list, edge_table=edge_table)
         elif format_type == "adjacency_matrix":
             return self._adjacency_to_transformer(graph_output.adjacency_matrix)
         elif format_type == "sequence":
             return self._sequence_to_transformer(graph_output.sequence)
         else:  # "all"
-            return {
-                "edge_list": self._edge_list_to_transformer(graph_output.edge_list),
-                "adjacency_matrix": self._adjacency_to_transformer(graph_output.adjacency_matrix),
-                "sequence": self._sequence_to_transformer(graph_output.sequence),
-            }
+            return self._to_transformer_all(graph_output, edge_table)
 
-    def _edge_list_to_transformer(self, edge_list: EdgeListFormat) -> dict[str, Any]:
-        """Convert edge list format to transformer input.
+    def _to_transformer_all(
+        self, graph_output: GraphOutput, edge_table: EdgeTable | None = None
+    ) -> dict[str, Any]:
+        """Convert every format, building the node type vocabulary once.
 
-        Produces format compatible with PyTorch Geometric and similar libraries.
+        The edge list and adjacency matrix of one conversion normally describe
+        the same nodes; when their node type columns agree, the type ids and
+        vocabulary computed for the edge list are reused for the matrix.
         """
-        # Node features
-        node_features = []
-        node_type_vocab: dict[str, int] = {}
+        edge_list = graph_output.edge_list
+        adjacency = graph_output.adjacency_matrix
+
+        node_type_names = [NODE_TYPE_NAMES[node.type] for node in edge_list.nodes]
+        node_type_ids, node_type_vocab = _build_vocab(node_type_names)
 
-        for node in edge_list.nodes:
-            # Build vocabulary
-            if node.type.value not in node_type_vocab:
-                node_type_vocab[node.type.value] = len(node_type_vocab)
+        adjacency_types = None
+        if adjacency.node_types == node_type_names:
+            # Copies, so the two outputs never alias each other
+            adjacency_types = (list(node_type_ids), dict(node_type_vocab))
 
-            node_features.append({
+        return {
+            "edge_list": self._edge_list_to_transformer(
+                edge_list, (node_type_names, node_type_ids, node_type_vocab), edge_table
+            ),
+            "adjacency_matrix": self._adjacency_to_transformer(adjacency, adjacency_types),
+            "sequence": self._sequence_to_transformer(graph_output.sequence),
+        }
+
+    def _edge_list_to_transformer(
+        self,
+        edge_list: EdgeListFormat,
+        node_types: tuple[list[str], list[int], dict[str, int]] | None = None,
+        edge_table: EdgeTable | None = None,
+    ) -> dict[str, Any]:
+        """Convert edge list format to transformer input.
+
+        Produces format compatible with PyTorch Geometric and similar libraries:
+        ``edge_index`` is a (2, E) int64 array and ``edge_types`` an int32 array.
+
+        Args:
+            edge_list: Edge list to convert.
+            node_types: Precomputed (type names, type ids, type vocabulary)
+                of the edge list nodes, if already built by the caller.
+            edge_table: Precomputed edge table of the edge list, if any.
+        """
+        # Node features
+        if node_types is None:
+            node_type_names = [NODE_TYPE_NAMES[node.type] for node in edge_list.nodes]
+            node_type_ids, node_type_vocab = _build_vocab(node_type_names)
+        else:
+            node_type_names, node_type_ids, node_type_vocab = node_types
+
+        node_features = [
+            {
                 "id": node.id,
-                "type_id": node_type_vocab[node.type.value],
-                "type": node.type.value,
+                "type_id": type_id,
+                "type": type_name,
                 "code": node.code,
                 "line": node.line_number,
                 "vars_defined": node.variables_defined,
                 "vars_used": node.variables_used,
-            })
-
-        # Edge index (COO format for PyTorch Geometric)
-        node_id_to_idx = {node.id: idx for idx, node in enumerate(edge_list.nodes)}
-        edge_index = [[], []]  # [source_indices, target_indices]
-        edge_types = []
-        edge_type_vocab: dict[str, int] = {}
-
-        for edge in edge_list.edges:
-            if edge.source in node_id_to_idx and edge.target in node_id_to_idx:
-                edge_index[0].append(node_id_to_idx[edge.source])
-                edge_index[1].append(node_id_to_idx[edge.target])
-
-                if edge.type.value not in edge_type_vocab:
-                    edge_type_vocab[edge.type.value] = len(edge_type_vocab)
-                edge_types.append(edge_type_vocab[edge.type.value])
+            }
+            for node, type_id, type_name in zip(edge_list.nodes, node_type_ids, node_type_names)
+        ]
+
+        # Edge index (COO format for PyTorch Geometric), ready for torch.from_numpy
+        if edge_table is None:
+            edge_table = _edge_list_table(edge_list)
+        edge_index = np.stack([edge_table.src, edge_table.dst]).astype(np.int64)
+
+        # Number edge types in order of first appearance
+        codes, first_seen = np.unique(edge_table.types, return_index=True)
+        codes = codes[np.argsort(first_seen)]
+        code_to_id = np.zeros(len(EDGE_TYPE_NAMES), dtype=np.int32)
+        code_to_id[codes] = np.arange(len(codes), dtype=np.int32)
+        edge_types = code_to_id[edge_table.types]
+        edge_type_vocab = {EDGE_TYPE_NAMES[code]: i for i, code in enumerate(codes.tolist())}
 
         return {
             "num_nodes": len(edge_list.nodes),
@@ -294,23 +440,37 @@ class GraphConverter:
             "edge_type_vocab": edge_type_vocab,
         }
 
-    def _adjacency_to_transformer(self, adj: AdjacencyMatrixFormat) -> dict[str, Any]:
-        """Convert adjacency matrix format to transformer input."""
+    def _adjacency_to_transformer(
+        self,
+        adj: AdjacencyMatrixFormat,
+        node_types: tuple[list[int], dict[str, int]] | None = None,
+    ) -> dict[str, Any]:
+        """Convert adjacency matrix format to transformer input.
+
+        Args:
+            adj: Adjacency matrix to convert.
+            node_types: Precomputed (type ids, type vocabulary) of the matrix
+                nodes, if already built by the caller.
+        """
         # Create type ID mappings
-        type_vocab: dict[str, int] = {}
-        type_ids = []
+        type_ids, type_vocab = node_types if node_types is not None else _build_vocab(adj.node_types)
 
-        for t in adj.node_types:
-            if t not in type_vocab:
-                type_vocab[t] = len(type_vocab)
-            type_ids.append(type_vocab[t])
+        if adj.sparse:
+            # (2, nnz) int64 indices, ready for torch.sparse_coo_tensor
+            adjacency = {
+                "indices": np.stack([adj.rows, adj.cols]).astype(np.int64),
+                "edge_type_codes": adj.coo_edge_type_codes,
+            }
+        else:
+            adjacency = {"adjacency_matrix": adj.matrix, "edge_type_codes": adj.edge_type_codes}
 
         return {
-            "adjacency_matrix": adj.matrix,
+            **adjacency,
+            "sparse": adj.sparse,
             "node_ids": adj.node_ids,
             "node_type_ids": type_ids,
             "node_type_vocab": type_vocab,
-            "edge_types_matrix": adj.edge_types_matrix,
+            "edge_type_vocab": adj.edge_type_vocab,
             "num_nodes": len(adj.node_ids),
         }
 
@@ -319,15 +479,9 @@ class GraphConverter:
 
         Produces tokenized sequence with vocabulary mapping.
         """
-        # Build vocabulary
+        # Build vocabulary and convert to IDs in one pass
         vocab: dict[str, int] = {"[PAD]": 0, "[UNK]": 1, "[CLS]": 2, "[SEP]": 3}
-
-        for token in seq.tokens:
-            if token not in vocab:
-                vocab[token] = len(vocab)
-
-        # Convert to IDs
-        token_ids = [vocab.get(t, vocab["[UNK]"]) for t in seq.tokens]
+        token_ids = [vocab.setdefault(token, len(vocab)) for token in seq.tokens]
 
         return {
             "tokens": seq.tokens,
@@ -339,26 +493,34 @@ class GraphConverter:
             "traversal_type": seq.traversal_type,
         }
 
+    def edge_table(self, graph_output: GraphOutput) -> EdgeTable:
+        """Resolve the edge list endpoints to rows of its node list.
+
+        Build it once and pass it to ``to_transformer_input``,
+        ``to_sparse_format`` and ``to_dgl_format`` when exporting one graph
+        in several formats.
+        """
+        return _edge_list_table(graph_output.edge_list)
+
     def to_sparse_format(
-        self, graph_output: GraphOutput
+        self, graph_output: GraphOutput, edge_table: EdgeTable | None = None
     ) -> dict[str, Any]:
         """Convert to sparse format for large graphs.
 
         Uses COO (Coordinate) format for efficient storage.
+
+        Args:
+            graph_output: GraphOutput object.
+            edge_table: Result of ``edge_table(graph_output)``, if already built.
         """
         edge_list = graph_output.edge_list
-        node_id_to_idx = {node.id: idx for idx, node in enumerate(edge_list.nodes)}
+        if edge_table is None:
+            edge_table = _edge_list_table(edge_list)
 
         # COO format: (row, col, data)
-        rows = []
-        cols = []
-        edge_data = []
-
-        for edge in edge_list.edges:
-            if edge.source in node_id_to_idx and edge.target in node_id_to_idx:
-                rows.append(node_id_to_idx[edge.source])
-                cols.append(node_id_to_idx[edge.target])
-                edge_data.append(edge.type.value)
+        rows = edge_table.src.tolist()
+        cols = edge_table.dst.tolist()
+        edge_data = [EDGE_TYPE_NAMES[code] for code in edge_table.types.tolist()]
 
         return {
             "format": "COO",
@@ -369,22 +531,25 @@ class GraphConverter:
             "nnz": len(rows),  # Number of non-zero elements
         }
 
-    def to_dgl_format(self, graph_output: GraphOutput) -> dict[str, Any]:
-        """Convert to DGL (Deep Graph Library) compatible format."""
-        edge_list = graph_output.edge_list
-        node_id_to_idx = {node.id: idx for idx, node in enumerate(edge_list.nodes)}
+    def to_dgl_format(
+        self, graph_output: GraphOutput, edge_table: EdgeTable | None = None
+    ) -> dict[str, Any]:
+        """Convert to DGL (Deep Graph Library) compatible format.
 
-        src_nodes = []
-        dst_nodes = []
+        Args:
+            graph_output: GraphOutput object.
+            edge_table: Result of ``edge_table(graph_output)``, if already built.
+        """
+        edge_list = graph_output.edge_list
+        if edge_table is None:
+            edge_table = _edge_list_table(edge_list)
 
-        for edge in edge_list.edges:
-            if edge.source in node_id_to_idx and edge.target in node_id_to_idx:
-                src_nodes.append(node_id_to_idx[edge.source])
-                dst_nodes.append(node_id_to_idx[edge.target])
+        src_nodes = edge_table.src.tolist()
+        dst_nodes = edge_table.dst.tolist()
 
         # Node features as list of dicts
         node_data = {
-            "type": [n.type.value for n in edge_list.nodes],
+            "type": [NODE_TYPE_NAMES[n.type] for n in edge_list.nodes],
             "code": [n.code for n in edge_list.nodes],
             "line": [n.line_number for n in edge_list.nodes],
         }
@@ -1,6 +1,7 @@
 """Java source code parser using javalang library."""
 
-from dataclasses import dataclass, field
+import hashlib
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 import javalang
@@ -42,7 +43,7 @@ from javalang.tree import (
 from app.core.exceptions import JavaParseError, InvalidJavaCodeError
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedVariable:
     """Represents a parsed variable reference."""
 
@@ -52,11 +53,11 @@ class ParsedVariable:
     column: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedStatement:
     """Represents a parsed statement with metadata."""
 
-    node: Node
+    node: Node | None  # None once detached from the AST (see method_without_ast)
     statement_type: str
     code: str
     line_number: int | None
@@ -65,9 +66,10 @@ class ParsedStatement:
     variables_used: list[str] = field(default_factory=list)
     children: list["ParsedStatement"] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    then_count: int | None = None  # IF only: children before this index form the then branch
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedMethod:
     """Represents a parsed method with its body statements."""
 
@@ -80,9 +82,41 @@ class ParsedMethod:
     line_start: int | None
     line_end: int | None
     is_constructor: bool = False
-
-
-@dataclass
+    source_hash: int = 0  # Digest of everything graph building reads; see _method_source_hash
+
+
+def _statement_key(stmt: ParsedStatement) -> tuple[Any, ...]:
+    """Get the graph-relevant content of a statement (everything but the AST node)."""
+    return (
+        stmt.statement_type,
+        stmt.code,
+        stmt.line_number,
+        stmt.column,
+        stmt.variables_defined,
+        stmt.variables_used,
+        sorted(stmt.metadata.items()),
+        stmt.then_count,
+        [_statement_key(child) for child in stmt.children],
+    )
+
+
+def _method_source_hash(method: ParsedMethod) -> int:
+    """Hash a parsed method so identical methods (same code at the same position) collide."""
+    key = (
+        method.name,
+        method.class_name,
+        method.return_type,
+        method.parameters,
+        method.parameter_types,
+        method.line_start,
+        method.is_constructor,
+        [_statement_key(stmt) for stmt in method.statements],
+    )
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@dataclass(slots=True)
 class ParsedClass:
     """Represents a parsed class with its methods."""
 
@@ -93,6 +127,25 @@ class ParsedClass:
     line_end: int | None
 
 
+def _statement_without_ast(stmt: ParsedStatement) -> ParsedStatement:
+    """Copy a statement tree, dropping the javalang nodes."""
+    return replace(stmt, node=None, children=[_statement_without_ast(child) for child in stmt.children])
+
+
+def method_without_ast(method: ParsedMethod) -> ParsedMethod:
+    """Copy a parsed method without its javalang nodes.
+
+    Graph building never reads the AST, and leaving it out makes the method
+    several times cheaper to pickle into a worker process.
+    """
+    return replace(method, statements=[_statement_without_ast(stmt) for stmt in method.statements])
+
+
+def class_without_ast(parsed_class: ParsedClass) -> ParsedClass:
+    """Copy a parsed class without the javalang nodes of its methods."""
+    return replace(parsed_class, methods=[method_without_ast(method) for method in parsed_class.methods])
+
+
 class JavaParser:
     """Parser for Java source code using javalang library."""
 
@@ -175,7 +228,7 @@ class JavaParser:
         if method.body:
             statements = self._parse_statements(method.body)
 
-        return ParsedMethod(
+        parsed_method = ParsedMethod(
             name=method.name,
             class_name=class_name,
             return_type=self._get_type_name(method.return_type) if method.return_type else "void",
@@ -186,6 +239,8 @@ class JavaParser:
             line_end=None,
             is_constructor=False,
         )
+        parsed_method.source_hash = _method_source_hash(parsed_method)
+        return parsed_method
 
     def _parse_constructor(self, constructor: ConstructorDeclaration, class_name: str) -> ParsedMethod:
         """Parse a constructor declaration."""
@@ -201,7 +256,7 @@ class JavaParser:
         if constructor.body:
             statements = self._parse_statements(constructor.body)
 
-        return ParsedMethod(
+        parsed_method = ParsedMethod(
             name=constructor.name,
             class_name=class_name,
             return_type="void",
@@ -212,6 +267,8 @@ class JavaParser:
             line_end=None,
             is_constructor=True,
         )
+        parsed_method.source_hash = _method_source_hash(parsed_method)
+        return parsed_method
 
     def _parse_statements(self, statements: list[Statement]) -> list[ParsedStatement]:
         """Parse a list of statements."""
@@ -346,6 +403,7 @@ class JavaParser:
                 then_parsed = self._parse_statement(stmt.then_statement)
                 if then_parsed:
                     children.append(then_parsed)
+        then_count = len(children)
 
         # Parse else branch
         if stmt.else_statement:
@@ -369,6 +427,7 @@ class JavaParser:
                 "has_else": stmt.else_statement is not None,
                 "condition": self._node_to_string(stmt.condition),
             },
+            then_count=then_count,
         )
 
     def _parse_while_statement(
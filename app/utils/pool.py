@@ -0,0 +1,42 @@
+"""Thread-safe object pool for reusing stateful service instances."""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from queue import Empty, SimpleQueue
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ObjectPool(Generic[T]):
+    """Pool of reusable objects that must not be shared between concurrent users.
+
+    Objects are created on demand when the pool is empty and at most
+    ``max_size`` idle objects are kept for reuse.
+    """
+
+    def __init__(self, factory: Callable[[], T], max_size: int) -> None:
+        self._factory = factory
+        self._max_size = max_size
+        self._idle: SimpleQueue[T] = SimpleQueue()
+
+    def acquire(self) -> T:
+        """Take an idle object from the pool, creating one if none is available."""
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            return self._factory()
+
+    def release(self, obj: T) -> None:
+        """Return an object to the pool, dropping it if the pool is full."""
+        if self._idle.qsize() < self._max_size:
+            self._idle.put(obj)
+
+    @contextmanager
+    def borrow(self) -> Iterator[T]:
+        """Acquire an object for the duration of a ``with`` block."""
+        obj = self.acquire()
+        try:
+            yield obj
+        finally:
+            self.release(obj)
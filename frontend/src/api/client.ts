@@ -9,10 +9,13 @@ export const apiClient = axios.create({
   },
 });
 
+export type GraphFormat = 'edge_list' | 'adjacency_matrix' | 'sequence';
+
 export interface AnalyzeRequest {
   code: string;
   include_method_graphs?: boolean;
   include_class_graph?: boolean;
+  formats?: GraphFormat[];
 }
 
 export interface GraphNode {
@@ -48,7 +51,12 @@ export interface GraphOutput {
     matrix: number[][];
     node_ids: string[];
     node_types: string[];
-    edge_types_matrix: (string | null)[][];
+    edge_type_codes: number[][];
+    edge_type_vocab: string[];
+    sparse: boolean;
+    rows: number[];
+    cols: number[];
+    coo_edge_type_codes: number[];
   };
   sequence: {
     tokens: string[];
@@ -104,7 +104,8 @@ def test_simple_method():
     payload = {
         "code": simple_code,
         "include_class_graph": False,
-        "include_method_graphs": True
+        "include_method_graphs": True,
+        "formats": ["edge_list", "sequence"]
     }
     
     response = httpx.post(f"{BASE_URL}/analyze", json=payload, timeout=30.0)
@@ -4,10 +4,10 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.services.java_parser import JavaParser
+from app.services.java_parser import JavaParser, ParsedClass, ParsedMethod
 from app.services.cfg_builder import CFGBuilder
 from app.services.ddg_builder import DDGBuilder
-from app.services.graph_converter import GraphConverter
+from app.services.graph_converter import GraphConverter, warm_up_kernels
 
 
 @pytest.fixture
@@ -16,12 +16,24 @@ def client() -> TestClient:
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def java_parser() -> JavaParser:
-    """Create Java parser instance."""
+    """Create Java parser instance shared by the session."""
     return JavaParser()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _warm_up(java_parser: JavaParser) -> None:
+    """Pay one-time setup costs before the first test rather than inside it.
+
+    Loads the javalang tables with a trivial parse and compiles (or loads
+    from Numba's cache) the DFS kernel, which takes far longer than any
+    single test.
+    """
+    java_parser.parse("class _Warm {}")
+    warm_up_kernels()
+
+
 @pytest.fixture
 def cfg_builder() -> CFGBuilder:
     """Create CFG builder instance."""
@@ -40,7 +52,7 @@ def graph_converter() -> GraphConverter:
     return GraphConverter()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_java_code() -> str:
     """Sample Java code for testing."""
     return '''
@@ -74,7 +86,7 @@ public class Calculator {
 '''
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def simple_java_method() -> str:
     """Simple Java class with one method."""
     return '''
@@ -87,7 +99,7 @@ public class Simple {
 '''
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def loop_java_code() -> str:
     """Java code with loop structures."""
     return '''
@@ -112,7 +124,7 @@ public class LoopExample {
 '''
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def conditional_java_code() -> str:
     """Java code with conditional structures."""
     return '''
@@ -139,3 +151,49 @@ public class ConditionalExample {
     }
 }
 '''
+
+
+# Parsed fixture sources, parsed once per session. Tests must not mutate them.
+
+
+@pytest.fixture(scope="session")
+def parsed_simple(java_parser: JavaParser, simple_java_method: str) -> list[ParsedClass]:
+    """Parsed classes of ``simple_java_method``."""
+    return java_parser.parse(simple_java_method)
+
+
+@pytest.fixture(scope="session")
+def parsed_sample(java_parser: JavaParser, sample_java_code: str) -> list[ParsedClass]:
+    """Parsed classes of ``sample_java_code``."""
+    return java_parser.parse(sample_java_code)
+
+
+@pytest.fixture(scope="session")
+def parsed_conditional(java_parser: JavaParser, conditional_java_code: str) -> list[ParsedClass]:
+    """Parsed classes of ``conditional_java_code``."""
+    return java_parser.parse(conditional_java_code)
+
+
+@pytest.fixture(scope="session")
+def parsed_loop(java_parser: JavaParser, loop_java_code: str) -> list[ParsedClass]:
+    """Parsed classes of ``loop_java_code``."""
+    return java_parser.parse(loop_java_code)
+
+
+@pytest.fixture(scope="session")
+def methods_by_name(
+    parsed_simple: list[ParsedClass],
+    parsed_sample: list[ParsedClass],
+    parsed_conditional: list[ParsedClass],
+    parsed_loop: list[ParsedClass],
+) -> dict[str, ParsedMethod]:
+    """Methods of every parsed fixture source, keyed by name (names are unique across them)."""
+    methods = [
+        method
+        for classes in (parsed_simple, parsed_sample, parsed_conditional, parsed_loop)
+        for parsed_class in classes
+        for method in parsed_class.methods
+    ]
+    by_name = {method.name: method for method in methods}
+    assert len(by_name) == len(methods), "fixture method names must be unique"
+    return by_name
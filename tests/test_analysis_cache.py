@@ -0,0 +1,73 @@
+"""Tests for the analysis response cache."""
+
+from app.models.schemas import AnalyzeResponse
+from app.services.analysis_cache import AnalysisCache, MethodGraphCache
+from app.services.java_parser import JavaParser
+
+
+class TestAnalysisCache:
+    """Test cases for AnalysisCache."""
+
+    def test_key_depends_on_options(self):
+        """Test keys differ when any output-shaping option differs."""
+        base = AnalysisCache.make_key("class A {}", True, True, {"edge_list"})
+
+        assert base == AnalysisCache.make_key("class A {}", True, True, {"edge_list"})
+        assert base != AnalysisCache.make_key("class B {}", True, True, {"edge_list"})
+        assert base != AnalysisCache.make_key("class A {}", False, True, {"edge_list"})
+        assert base != AnalysisCache.make_key("class A {}", True, True, {"edge_list", "sequence"})
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted first."""
+        cache = AnalysisCache(max_size=2)
+        cache.put(b"a", AnalyzeResponse(class_name="A"))
+        cache.put(b"b", AnalyzeResponse(class_name="B"))
+
+        cache.get(b"a")
+        cache.put(b"c", AnalyzeResponse(class_name="C"))
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a").class_name == "A"
+        assert cache.get(b"c").class_name == "C"
+
+    def test_zero_size_disables_cache(self):
+        """Test a zero-sized cache stores nothing."""
+        cache = AnalysisCache(max_size=0)
+        cache.put(b"a", AnalyzeResponse())
+
+        assert len(cache) == 0
+
+
+class TestMethodGraphCache:
+    """Test cases for MethodGraphCache."""
+
+    def test_unchanged_method_keeps_its_key(self, java_parser: JavaParser):
+        """Test editing one method leaves the other method's key unchanged."""
+        before = java_parser.parse(
+            "public class A {\n"
+            "    public int one() { return 1; }\n"
+            "    public int two() { return 2; }\n"
+            "}"
+        )[0]
+        after = java_parser.parse(
+            "public class A {\n"
+            "    public int one() { return 1; }\n"
+            "    public int two() { return 3; }\n"
+            "}"
+        )[0]
+
+        def key(method):
+            return MethodGraphCache.make_key(method, "A", {"edge_list"})
+
+        assert key(before.methods[0]) == key(after.methods[0])
+        assert key(before.methods[1]) != key(after.methods[1])
+
+    def test_key_depends_on_position_and_formats(self, java_parser: JavaParser):
+        """Test keys differ when the method moves or other formats are requested."""
+        method = java_parser.parse("public class A { int one() { return 1; } }")[0].methods[0]
+        moved = java_parser.parse("\npublic class A { int one() { return 1; } }")[0].methods[0]
+
+        base = MethodGraphCache.make_key(method, "A", {"edge_list"})
+
+        assert base != MethodGraphCache.make_key(moved, "A", {"edge_list"})
+        assert base != MethodGraphCache.make_key(method, "A", {"edge_list", "sequence"})
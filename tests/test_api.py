@@ -1,8 +1,17 @@
 """Tests for API endpoints."""
 
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.config import get_settings
+from app.core.exceptions import CFGBuildError
+from app.api import routes
+from app.core.executor import get_process_pool
+
 
 class TestAPIEndpoints:
     """Test cases for API endpoints."""
@@ -124,6 +133,37 @@ class TestAPIEndpoints:
 
         assert response.status_code == 422  # Validation error
 
+    def test_analyze_code_too_long(self, client: TestClient):
+        """Test code over max_code_length fails request validation."""
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": "x" * (get_settings().max_code_length + 1)},
+        )
+
+        assert response.status_code == 422
+
+    def test_analyze_body_too_large(self, client: TestClient):
+        """Test oversized JSON bodies are rejected before being decoded."""
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": "x" * (get_settings().max_code_length * 5)},
+            headers={"origin": "http://example.com"},
+        )
+
+        assert response.status_code == 413
+        assert "access-control-allow-origin" in response.headers
+
+    def test_analyze_multibyte_code_within_limit(self, client: TestClient):
+        """Test code of max_code_length 4-byte characters is not cut off by the byte cap."""
+        body = '{"code": "' + "\U0001f600" * get_settings().max_code_length + '"}'
+        response = client.post(
+            "/api/v1/analyze",
+            content=body.encode(),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code != 413
+
     def test_edge_list_format(self, client: TestClient, simple_java_method: str):
         """Test edge list format structure."""
         response = client.post(
@@ -207,3 +247,216 @@ class TestAPIEndpoints:
         assert "add" in method_names
         assert "factorial" in method_names
         assert "divide" in method_names
+
+    def test_analyze_preserves_method_order(self, client: TestClient, sample_java_code: str):
+        """Test method graphs built in parallel keep source order."""
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": sample_java_code},
+        )
+
+        data = response.json()
+        method_names = [m["method_name"] for m in data["method_graphs"]]
+        assert method_names == ["add", "factorial", "divide"]
+
+    def test_analyze_file(self, client: TestClient, simple_java_method: str):
+        """Test analyzing an uploaded Java file."""
+        response = client.post(
+            "/api/v1/analyze/file",
+            files={"file": ("Simple.java", simple_java_method.encode("utf-8"), "text/plain")},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source_file"] == "Simple.java"
+        assert data["class_name"] == "Simple"
+
+    def test_analyze_file_rejects_non_java(self, client: TestClient):
+        """Test uploads without a .java extension are rejected."""
+        response = client.post(
+            "/api/v1/analyze/file",
+            files={"file": ("notes.txt", b"hello", "text/plain")},
+        )
+
+        assert response.status_code == 400
+        assert "Java source file" in response.json()["detail"]
+
+    def test_analyze_file_invalid_encoding(self, client: TestClient):
+        """Test uploading a file that is not valid UTF-8."""
+        response = client.post(
+            "/api/v1/analyze/file",
+            files={"file": ("Bad.java", b"public class Bad { \xff\xfe }", "text/plain")},
+        )
+
+        assert response.status_code == 400
+
+    def test_analyze_file_too_large(self, client: TestClient):
+        """Test oversized uploads are rejected from Content-Length alone."""
+        response = client.post(
+            "/api/v1/analyze/file",
+            content=b"x",
+            headers={"content-type": "multipart/form-data; boundary=x", "content-length": str(1 << 30)},
+        )
+
+        assert response.status_code == 413
+
+    def test_adjacency_matrix_edge_type_codes(self, client: TestClient, simple_java_method: str):
+        """Test edge type codes line up with adjacency matrix cells."""
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": simple_java_method, "formats": ["adjacency_matrix"]},
+        )
+
+        adj = response.json()["method_graphs"][0]["cfg"]["adjacency_matrix"]
+        vocab = adj["edge_type_vocab"]
+
+        for row, code_row in zip(adj["matrix"], adj["edge_type_codes"]):
+            for cell, code in zip(row, code_row):
+                if cell:
+                    assert 0 <= code < len(vocab)
+                else:
+                    assert code == -1
+
+    def test_formats_default_to_edge_list(self, client: TestClient, simple_java_method: str):
+        """Test only the edge list is built when no formats are requested."""
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": simple_java_method},
+        )
+
+        cfg = response.json()["method_graphs"][0]["cfg"]
+        assert cfg["edge_list"]["node_count"] > 0
+        assert cfg["adjacency_matrix"]["node_ids"] == []
+        assert cfg["sequence"]["tokens"] == []
+
+    def test_formats_opt_in(self, client: TestClient, simple_java_method: str):
+        """Test requested formats are built and others are left empty."""
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": simple_java_method, "formats": ["adjacency_matrix", "sequence"]},
+        )
+
+        cfg = response.json()["method_graphs"][0]["cfg"]
+        assert cfg["edge_list"]["nodes"] == []
+        assert cfg["adjacency_matrix"]["node_ids"]
+        assert cfg["sequence"]["tokens"]
+
+    def test_analyze_file_formats(self, client: TestClient, simple_java_method: str):
+        """Test formats can be chosen for file uploads."""
+        response = client.post(
+            "/api/v1/analyze/file",
+            files={"file": ("Simple.java", simple_java_method.encode("utf-8"), "text/plain")},
+            data={"formats": ["edge_list", "sequence"]},
+        )
+
+        assert response.status_code == 200
+        cfg = response.json()["method_graphs"][0]["cfg"]
+        assert cfg["sequence"]["tokens"]
+        assert cfg["adjacency_matrix"]["node_ids"] == []
+
+    def test_repeated_analysis_is_cached(self, client: TestClient):
+        """Test identical requests are served from the analysis cache."""
+        code = "public class Cached { public int one() { return 1; } }"
+
+        first = client.post("/api/v1/analyze", json={"code": code})
+        second = client.post("/api/v1/analyze", json={"code": code})
+        other_formats = client.post("/api/v1/analyze", json={"code": code, "formats": ["sequence"]})
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        assert other_formats.headers["X-Cache"] == "MISS"
+
+    def test_analyze_recovers_from_dead_worker(self, client: TestClient):
+        """Test a pool broken by a dying worker is rebuilt instead of failing every request."""
+        pool = get_process_pool()
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": "public class Revived { public int one() { return 1; } }"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["method_count"] == 1
+        assert get_process_pool() is not pool
+
+    def test_failed_method_build_still_awaits_class_build(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test an unexpected method failure does not orphan the class build."""
+        finished: list[str] = []
+
+        async def run_in_process_pool(func, *args):
+            if func is routes._build_method_graphs_worker:
+                raise RuntimeError("worker failed")
+            await asyncio.sleep(0.05)
+            finished.append(func.__name__)
+            return func(*args)
+
+        monkeypatch.setattr(routes, "run_in_process_pool", run_in_process_pool)
+
+        with pytest.raises(RuntimeError):
+            client.post(
+                "/api/v1/analyze",
+                json={"code": "public class Orphan { public int one() { return 1; } }"},
+            )
+
+        assert finished == ["_build_class_graph_worker"]
+
+    def test_method_graphs_are_built_in_batches(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test methods go to the pool in batches, without their AST, and keep their order."""
+        batch_sizes: list[int] = []
+
+        async def run_in_process_pool(func, *args):
+            if func is routes._build_method_graphs_worker:
+                methods = args[0]
+                batch_sizes.append(len(methods))
+                assert all(stmt.node is None for method in methods for stmt in method.statements)
+            return func(*args)
+
+        monkeypatch.setattr(routes, "run_in_process_pool", run_in_process_pool)
+        method_count = routes._METHODS_PER_TASK + 1
+        methods = "".join(f"int batched{i}(int a) {{ return a + {i}; }}" for i in range(method_count))
+
+        response = client.post(
+            "/api/v1/analyze",
+            json={"code": f"public class Batched {{ {methods} }}", "include_class_graph": False},
+        )
+
+        assert response.status_code == 200
+        assert batch_sizes == [routes._METHODS_PER_TASK, 1]
+        names = [m["method_name"] for m in response.json()["method_graphs"]]
+        assert names == [f"batched{i}" for i in range(method_count)]
+
+    def test_method_build_error_is_reported_per_method(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test a method that fails to build does not drop the rest of its batch."""
+        build_method_graph = routes._build_method_graph
+
+        def failing_build(method, **kwargs):
+            if method.name == "broken":
+                raise CFGBuildError("no graph")
+            return build_method_graph(method, **kwargs)
+
+        async def run_in_process_pool(func, *args):
+            return func(*args)
+
+        monkeypatch.setattr(routes, "_build_method_graph", failing_build)
+        monkeypatch.setattr(routes, "run_in_process_pool", run_in_process_pool)
+
+        response = client.post(
+            "/api/v1/analyze",
+            json={
+                "code": "public class Partly { int broken() { return 0; } int fine() { return 1; } }",
+                "include_class_graph": False,
+            },
+        )
+
+        data = response.json()
+        assert [m["method_name"] for m in data["method_graphs"]] == ["fine"]
+        assert data["errors"] == ["Error processing method broken: no graph"]
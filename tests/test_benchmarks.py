@@ -0,0 +1,27 @@
+"""Parser benchmarks; need pytest-benchmark and are skipped without it."""
+
+import pytest
+
+from app.services.java_parser import JavaParser
+
+pytest.importorskip("pytest_benchmark")
+
+METHOD_COUNT = 1000
+
+
+@pytest.fixture(scope="module")
+def big_java_code() -> str:
+    """Synthetic class with METHOD_COUNT one-line methods."""
+    methods = "".join(f"    int m{i}(int a) {{ return a; }}\n" for i in range(METHOD_COUNT))
+    return f"public class Big {{\n{methods}}}\n"
+
+
+class TestParserBenchmark:
+    """Benchmarks that expose super-linear parsing cost."""
+
+    @pytest.mark.benchmark(group="parse", disable_gc=True)
+    def test_parse_scaling(self, benchmark, java_parser: JavaParser, big_java_code: str):
+        """Benchmark parsing a class with many methods."""
+        classes = benchmark(java_parser.parse, big_java_code)
+
+        assert len(classes[0].methods) == METHOD_COUNT
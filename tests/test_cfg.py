@@ -1,20 +1,24 @@
 """Tests for CFG builder."""
 
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from pydantic import TypeAdapter
 
-from app.services.java_parser import JavaParser
+from app.services.java_parser import JavaParser, ParsedClass
 from app.services.cfg_builder import CFGBuilder
-from app.models.graph_models import NodeType, EdgeType
+from app.models.graph_models import GraphEdge, GraphNode, NodeType, EdgeType
 
 
 class TestCFGBuilder:
     """Test cases for CFGBuilder."""
 
     def test_build_simple_method_cfg(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, simple_java_method: str
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
     ):
         """Test building CFG for a simple method."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         graph, nodes, edges = cfg_builder.build_method_cfg(method)
@@ -27,10 +31,10 @@ class TestCFGBuilder:
         assert len(exit_nodes) == 1
 
     def test_cfg_has_edges(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, simple_java_method: str
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
     ):
         """Test CFG has edges connecting nodes."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         graph, nodes, edges = cfg_builder.build_method_cfg(method)
@@ -38,10 +42,10 @@ class TestCFGBuilder:
         assert len(edges) > 0
 
     def test_if_statement_cfg(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, conditional_java_code: str
+        self, cfg_builder: CFGBuilder, parsed_conditional: list[ParsedClass]
     ):
         """Test CFG for if statement has condition node and branches."""
-        classes = java_parser.parse(conditional_java_code)
+        classes = parsed_conditional
         abs_method = next(m for m in classes[0].methods if m.name == "abs")
 
         graph, nodes, edges = cfg_builder.build_method_cfg(abs_method)
@@ -55,10 +59,10 @@ class TestCFGBuilder:
         assert EdgeType.TRUE_BRANCH in edge_types or EdgeType.SEQUENTIAL in edge_types
 
     def test_for_loop_cfg(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, loop_java_code: str
+        self, cfg_builder: CFGBuilder, parsed_loop: list[ParsedClass]
     ):
         """Test CFG for for loop has loop header and back edge."""
-        classes = java_parser.parse(loop_java_code)
+        classes = parsed_loop
         sum_method = next(m for m in classes[0].methods if m.name == "sumArray")
 
         graph, nodes, edges = cfg_builder.build_method_cfg(sum_method)
@@ -72,10 +76,10 @@ class TestCFGBuilder:
         assert EdgeType.LOOP_BACK in edge_types
 
     def test_while_loop_cfg(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, loop_java_code: str
+        self, cfg_builder: CFGBuilder, parsed_loop: list[ParsedClass]
     ):
         """Test CFG for while loop."""
-        classes = java_parser.parse(loop_java_code)
+        classes = parsed_loop
         while_method = next(m for m in classes[0].methods if m.name == "whileExample")
 
         graph, nodes, edges = cfg_builder.build_method_cfg(while_method)
@@ -85,10 +89,10 @@ class TestCFGBuilder:
         assert len(loop_headers) >= 1
 
     def test_try_catch_cfg(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, sample_java_code: str
+        self, cfg_builder: CFGBuilder, parsed_sample: list[ParsedClass]
     ):
         """Test CFG for try-catch block."""
-        classes = java_parser.parse(sample_java_code)
+        classes = parsed_sample
         divide_method = next(m for m in classes[0].methods if m.name == "divide")
 
         graph, nodes, edges = cfg_builder.build_method_cfg(divide_method)
@@ -105,10 +109,10 @@ class TestCFGBuilder:
         assert EdgeType.EXCEPTION in edge_types
 
     def test_class_cfg(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, sample_java_code: str
+        self, cfg_builder: CFGBuilder, parsed_sample: list[ParsedClass]
     ):
         """Test building class-level CFG."""
-        classes = java_parser.parse(sample_java_code)
+        classes = parsed_sample
         parsed_class = classes[0]
 
         graph, nodes, edges = cfg_builder.build_class_cfg(parsed_class)
@@ -125,10 +129,10 @@ class TestCFGBuilder:
         assert len(method_entries) == 3  # add, factorial, divide
 
     def test_cfg_node_has_code(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, simple_java_method: str
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
     ):
         """Test CFG nodes have code snippets."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         graph, nodes, edges = cfg_builder.build_method_cfg(method)
@@ -138,10 +142,10 @@ class TestCFGBuilder:
         assert len(nodes_with_code) > 0
 
     def test_cfg_node_has_line_numbers(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, simple_java_method: str
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
     ):
         """Test CFG nodes have line numbers."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         graph, nodes, edges = cfg_builder.build_method_cfg(method)
@@ -151,10 +155,10 @@ class TestCFGBuilder:
         assert entry_nodes[0].line_number is not None
 
     def test_return_statement_connects_to_exit(
-        self, java_parser: JavaParser, cfg_builder: CFGBuilder, simple_java_method: str
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
     ):
         """Test return statement connects to method exit."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         graph, nodes, edges = cfg_builder.build_method_cfg(method)
@@ -168,3 +172,143 @@ class TestCFGBuilder:
             return_edges = [e for e in edges if e.source == return_nodes[0].id]
             targets = [e.target for e in return_edges]
             assert exit_nodes[0].id in targets
+
+    def test_exit_nodes_have_no_self_loops(
+        self, cfg_builder: CFGBuilder, parsed_sample: list[ParsedClass]
+    ):
+        """Test the exit node is never among the terminals wired back to it."""
+        classes = parsed_sample
+
+        for graph, nodes, _ in [cfg_builder.build_class_cfg(classes[0])] + [
+            cfg_builder.build_method_cfg(method) for method in classes[0].methods
+        ]:
+            exits = [n.id for n in nodes if n.type == NodeType.METHOD_EXIT]
+            assert exits
+            assert not any(graph.has_edge(exit_id, exit_id) for exit_id in exits)
+
+    def test_edges_match_graph(
+        self, cfg_builder: CFGBuilder, parsed_sample: list[ParsedClass]
+    ):
+        """Test the edge list holds exactly one edge per graph edge, in graph order."""
+        classes = parsed_sample
+
+        graph, nodes, edges = cfg_builder.build_class_cfg(classes[0])
+
+        assert [n.id for n in nodes] == list(graph.nodes())
+        assert [(e.source, e.target) for e in edges] == list(graph.edges())
+
+    def test_cfg_node_keeps_statement_details(
+        self, cfg_builder: CFGBuilder, parsed_conditional: list[ParsedClass]
+    ):
+        """Test CFG nodes keep the column and metadata of their statement."""
+        classes = parsed_conditional
+        abs_method = next(m for m in classes[0].methods if m.name == "abs")
+
+        graph, nodes, edges = cfg_builder.build_method_cfg(abs_method)
+
+        condition = next(n for n in nodes if n.type == NodeType.CONDITION)
+        assert condition.column is not None
+        assert "condition" in condition.metadata
+        assert "then_count" not in condition.metadata
+
+    def test_if_branches_of_unequal_length(
+        self, java_parser: JavaParser, cfg_builder: CFGBuilder
+    ):
+        """Test the then/else split follows the source, not an even halving."""
+        code = """
+        public class Branches {
+            public int pick(int x) {
+                int y = 0;
+                if (x > 0) {
+                    y = 1;
+                    y = y + 2;
+                    y = y * 3;
+                } else {
+                    y = -1;
+                }
+                return y;
+            }
+        }
+        """
+        method = java_parser.parse(code)[0].methods[0]
+
+        graph, nodes, edges = cfg_builder.build_method_cfg(method)
+
+        codes = {n.id: n.code for n in nodes}
+        true_target = next(e.target for e in edges if e.type == EdgeType.TRUE_BRANCH)
+        false_target = next(e.target for e in edges if e.type == EdgeType.FALSE_BRANCH)
+        assert "y = 1" in codes[true_target]
+        assert "y = -1" in codes[false_target]
+
+    def test_constructed_nodes_match_validated(
+        self, cfg_builder: CFGBuilder, parsed_sample: list[ParsedClass]
+    ):
+        """Test unvalidated builder nodes and edges equal validated ones and serialize alike."""
+        classes = parsed_sample
+        graph, nodes, edges = cfg_builder.build_class_cfg(classes[0])
+
+        validated_nodes = [GraphNode(**dataclasses.asdict(node)) for node in nodes]
+        validated_edges = [GraphEdge(**dataclasses.asdict(edge)) for edge in edges]
+
+        assert nodes == validated_nodes
+        assert edges == validated_edges
+        node_adapter = TypeAdapter(list[GraphNode])
+        assert node_adapter.dump_json(nodes) == node_adapter.dump_json(validated_nodes)
+
+    def test_concurrent_builds_share_one_builder(
+        self, cfg_builder: CFGBuilder, parsed_sample: list[ParsedClass]
+    ):
+        """Test one builder can build several CFGs at once without mixing them up."""
+        methods = parsed_sample[0].methods * 8
+        expected = [cfg_builder.build_method_cfg(method)[1:] for method in methods]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(cfg_builder.build_method_cfg, methods))
+
+        assert [result[1:] for result in results] == expected
+
+    def test_break_and_continue_are_wired_to_their_loop(
+        self, java_parser: JavaParser, cfg_builder: CFGBuilder
+    ):
+        """Test break leaves the loop and continue returns to its header."""
+        code = """
+        public class Jumps {
+            public int scan(int[] xs) {
+                int total = 0;
+                for (int i = 0; i < xs.length; i++) {
+                    int x = xs[i];
+                    if (x < 0) {
+                        continue;
+                    }
+                    switch (x) {
+                        case 0:
+                            break;
+                        default:
+                            total = total + x;
+                    }
+                    if (total > 100) {
+                        break;
+                    }
+                }
+                return total;
+            }
+        }
+        """
+        method = java_parser.parse(code)[0].methods[0]
+
+        graph, nodes, edges = cfg_builder.build_method_cfg(method)
+
+        by_type = {}
+        for node in nodes:
+            by_type.setdefault(node.type, []).append(node.id)
+        loop_header = by_type[NodeType.LOOP_HEADER][0]
+        switch_node = by_type[NodeType.SWITCH][0]
+        return_node = by_type[NodeType.RETURN][0]
+        continue_node = by_type[NodeType.CONTINUE][0]
+        switch_break, loop_break = by_type[NodeType.BREAK]
+
+        assert list(graph.successors(continue_node)) == [loop_header]
+        # The break in the switch only leaves the switch, not the loop
+        assert return_node not in graph.successors(switch_break)
+        assert switch_node not in graph.successors(switch_break)
+        assert list(graph.successors(loop_break)) == [return_node]
@@ -1,8 +1,10 @@
 """Tests for DDG builder."""
 
+from bisect import bisect_right
+
 import pytest
 
-from app.services.java_parser import JavaParser
+from app.services.java_parser import JavaParser, ParsedClass, ParsedMethod, ParsedStatement
 from app.services.cfg_builder import CFGBuilder
 from app.services.ddg_builder import DDGBuilder
 from app.models.graph_models import NodeType, EdgeType
@@ -13,13 +15,12 @@ class TestDDGBuilder:
 
     def test_build_simple_method_ddg(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        simple_java_method: str,
+        parsed_simple: list[ParsedClass],
     ):
         """Test building DDG for a simple method."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         # Build CFG first for reference
@@ -32,13 +33,12 @@ class TestDDGBuilder:
 
     def test_ddg_parameter_definitions(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        simple_java_method: str,
+        parsed_simple: list[ParsedClass],
     ):
         """Test DDG has parameter definitions."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         _, cfg_nodes, _ = cfg_builder.build_method_cfg(method)
@@ -53,13 +53,12 @@ class TestDDGBuilder:
 
     def test_ddg_has_data_edges(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        simple_java_method: str,
+        parsed_simple: list[ParsedClass],
     ):
         """Test DDG has data dependence edges."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         _, cfg_nodes, _ = cfg_builder.build_method_cfg(method)
@@ -72,13 +71,12 @@ class TestDDGBuilder:
 
     def test_ddg_variable_tracking(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        loop_java_code: str,
+        parsed_loop: list[ParsedClass],
     ):
         """Test DDG tracks variables in loops."""
-        classes = java_parser.parse(loop_java_code)
+        classes = parsed_loop
         sum_method = next(m for m in classes[0].methods if m.name == "sumArray")
 
         _, cfg_nodes, _ = cfg_builder.build_method_cfg(sum_method)
@@ -93,13 +91,12 @@ class TestDDGBuilder:
 
     def test_class_ddg(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        sample_java_code: str,
+        parsed_sample: list[ParsedClass],
     ):
         """Test building class-level DDG."""
-        classes = java_parser.parse(sample_java_code)
+        classes = parsed_sample
         parsed_class = classes[0]
 
         _, cfg_nodes, _ = cfg_builder.build_class_cfg(parsed_class)
@@ -142,13 +139,12 @@ class TestDDGBuilder:
 
     def test_ddg_node_has_variables(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        simple_java_method: str,
+        parsed_simple: list[ParsedClass],
     ):
         """Test DDG nodes track defined and used variables."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         _, cfg_nodes, _ = cfg_builder.build_method_cfg(method)
@@ -163,13 +159,12 @@ class TestDDGBuilder:
 
     def test_ddg_conditional_dependencies(
         self,
-        java_parser: JavaParser,
         cfg_builder: CFGBuilder,
         ddg_builder: DDGBuilder,
-        conditional_java_code: str,
+        parsed_conditional: list[ParsedClass],
     ):
         """Test DDG handles conditional statements."""
-        classes = java_parser.parse(conditional_java_code)
+        classes = parsed_conditional
         classify_method = next(m for m in classes[0].methods if m.name == "classify")
 
         _, cfg_nodes, _ = cfg_builder.build_method_cfg(classify_method)
@@ -181,3 +176,51 @@ class TestDDGBuilder:
             all_defined.extend(node.variables_defined)
 
         assert "grade" in all_defined
+
+    def test_reaching_definition_lookup_matches_scan(
+        self,
+        cfg_builder: CFGBuilder,
+        ddg_builder: DDGBuilder,
+        parsed_sample: list[ParsedClass],
+    ):
+        """Test the binary-search lookup picks the same definitions as a full scan."""
+        classes = parsed_sample
+        _, cfg_nodes, _ = cfg_builder.build_class_cfg(classes[0])
+        ddg_builder.build_class_ddg(classes[0], cfg_nodes)
+
+        for variable, uses in ddg_builder._uses.items():
+            definitions = ddg_builder._definitions.get(variable)
+            if not definitions:
+                continue
+            lines, reaching_after = ddg_builder._reaching_prefix_table(definitions)
+            for use in uses:
+                expected = ddg_builder._find_reaching_definition(variable, use, definitions)
+                assert reaching_after[bisect_right(lines, use.line)] is expected
+
+    def test_ddg_handles_deep_nesting(self, ddg_builder: DDGBuilder):
+        """Test statements nested deeper than the recursion limit are all processed."""
+        depth = 5000
+        stmt = ParsedStatement(None, "ASSIGNMENT", "x = x + 1;", depth, 1, ["x"], ["x"])
+        for line in range(depth - 1, 0, -1):
+            stmt = ParsedStatement(None, "BLOCK", "{", line, 1, children=[stmt])
+        method = ParsedMethod("deep", "Deep", "void", ["x"], ["int"], [stmt], 0, depth + 1)
+
+        graph, nodes, edges = ddg_builder.build_method_ddg(method, [])
+
+        assert len(nodes) == depth + 1
+        assert nodes[-1].code == "x = x + 1;"
+
+    def test_single_definition_reaches_only_later_uses(self, ddg_builder: DDGBuilder):
+        """Test a lone definition links to every use except those on earlier lines."""
+        statements = [
+            ParsedStatement(None, "EXPRESSION", "log(y);", 2, 1, [], ["y"]),
+            ParsedStatement(None, "DECLARATION", "int y = p;", 3, 1, ["y"], ["p"]),
+            ParsedStatement(None, "RETURN", "return p + y;", 4, 1, [], ["p", "y"]),
+        ]
+        method = ParsedMethod("f", "F", "int", ["p"], ["int"], statements, 1, 5)
+
+        _, nodes, edges = ddg_builder.build_method_ddg(method, [])
+
+        pairs = {(edge.source, edge.target) for edge in edges}
+        entry, log, decl, ret = (node.id for node in nodes)
+        assert pairs == {(entry, decl), (entry, ret), (decl, ret)}
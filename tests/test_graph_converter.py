@@ -0,0 +1,220 @@
+"""Tests for graph format conversion."""
+
+import networkx as nx
+import numpy as np
+
+from app.services.java_parser import ParsedClass
+from app.services.cfg_builder import CFGBuilder
+from app.services.graph_converter import GraphConverter, _dfs_kernel
+from app.models.graph_models import (
+    EdgeListFormat,
+    EdgeTable,
+    EdgeType,
+    GraphEdge,
+    GraphNode,
+    GraphOutput,
+    NodeTable,
+    NodeType,
+    SequenceFormat,
+)
+
+
+class TestGraphConverter:
+    """Test cases for GraphConverter."""
+
+    def test_node_table_columns(
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
+    ):
+        """Test node table columns mirror the node list."""
+        classes = parsed_simple
+        _, nodes, _ = cfg_builder.build_method_cfg(classes[0].methods[0])
+
+        table = NodeTable.from_nodes(nodes)
+
+        assert len(table) == len(nodes)
+        for row, node in enumerate(nodes):
+            assert table.ids[row] == node.id
+            assert table.codes[row] == node.code
+            assert table.variables_defined(row) == node.variables_defined
+            assert table.variables_used(row) == node.variables_used
+
+    def test_edge_table_drops_dangling_edges(
+        self, cfg_builder: CFGBuilder, parsed_simple: list[ParsedClass]
+    ):
+        """Test edge table only keeps edges between known nodes."""
+        classes = parsed_simple
+        _, nodes, edges = cfg_builder.build_method_cfg(classes[0].methods[0])
+
+        table = EdgeTable.from_edges(edges, {nodes[0].id: 0})
+
+        assert len(table) == 0
+
+    def test_edge_table_csr_matches_graph(
+        self, cfg_builder: CFGBuilder, parsed_loop: list[ParsedClass]
+    ):
+        """Test the CSR view lists every node's successors in graph order."""
+        classes = parsed_loop
+        graph, nodes, edges = cfg_builder.build_class_cfg(classes[0])
+        node_table = NodeTable.from_nodes(nodes)
+
+        indptr, indices = EdgeTable.from_edges(edges, node_table.index).to_csr(len(node_table))
+
+        assert indptr.dtype == np.int32 and indices.dtype == np.int32
+        for row, node_id in enumerate(node_table.ids):
+            successors = indices[indptr[row]:indptr[row + 1]]
+            assert [node_table.ids[i] for i in successors] == list(graph.successors(node_id))
+
+    def test_adjacency_matches_edges(
+        self,
+        cfg_builder: CFGBuilder,
+        graph_converter: GraphConverter,
+        parsed_loop: list[ParsedClass],
+    ):
+        """Test adjacency matrix has a cell for every edge."""
+        classes = parsed_loop
+        graph, nodes, edges = cfg_builder.build_method_cfg(classes[0].methods[0])
+
+        output = graph_converter.convert(graph, nodes, edges)
+        adj = output.adjacency_matrix
+        index = {node_id: row for row, node_id in enumerate(adj.node_ids)}
+
+        assert adj.matrix.sum() == len({(e.source, e.target) for e in edges})
+        for edge in edges:
+            code = adj.edge_type_codes[index[edge.source], index[edge.target]]
+            assert adj.edge_type_vocab[code] == edge.type.name
+
+    def test_dfs_order_follows_successor_order(self):
+        """Test the DFS kernel visits successors in order and records entering edges."""
+        # 0 -> 1, 0 -> 2, 1 -> 2; 3 is a second root
+        indptr = np.array([0, 2, 3, 3, 3], dtype=np.int32)
+        indices = np.array([1, 2, 2], dtype=np.int32)
+
+        order, via = _dfs_kernel()(indptr, indices, np.array([0, 3], dtype=np.int32))
+
+        assert order.tolist() == [0, 1, 2, 3]
+        assert via.tolist() == [-1, 0, 2, -1]
+
+    def test_sequence_handles_deep_graphs(self, graph_converter: GraphConverter):
+        """Test sequence conversion of a chain deeper than the recursion limit."""
+        graph = nx.DiGraph()
+        nodes = [GraphNode(id=f"n{i}", type=NodeType.STATEMENT) for i in range(5000)]
+        for node in nodes:
+            graph.add_node(node.id, type=node.type)
+        for source, target in zip(nodes, nodes[1:]):
+            graph.add_edge(source.id, target.id, type=EdgeType.SEQUENTIAL)
+
+        output = graph_converter.convert(graph, nodes, [], formats={"sequence"})
+
+        assert output.sequence.node_sequence == [node.id for node in nodes]
+        assert output.sequence.tokens.count("[EDGE:SEQUENTIAL]") == len(nodes) - 1
+
+    def test_transformer_vocabs_follow_first_appearance(
+        self,
+        cfg_builder: CFGBuilder,
+        graph_converter: GraphConverter,
+        parsed_conditional: list[ParsedClass],
+    ):
+        """Test transformer type IDs index vocabularies built in first-seen order."""
+        classes = parsed_conditional
+        graph, nodes, edges = cfg_builder.build_class_cfg(classes[0])
+        output = graph_converter.convert(graph, nodes, edges)
+
+        result = graph_converter.to_transformer_input(output, "all")
+
+        edge_list = result["edge_list"]
+        node_types = [feature["type"] for feature in edge_list["node_features"]]
+        assert list(edge_list["node_type_vocab"]) == list(dict.fromkeys(node_types))
+        assert [feature["type_id"] for feature in edge_list["node_features"]] == [
+            edge_list["node_type_vocab"][t] for t in node_types
+        ]
+        assert result["adjacency_matrix"]["node_type_vocab"] == edge_list["node_type_vocab"]
+        assert edge_list["edge_index"].shape == (2, len(edges))
+        edge_type_names = list(edge_list["edge_type_vocab"])
+        assert [edge_type_names[i] for i in edge_list["edge_types"]] == [e.type.name for e in edges]
+        sequence = result["sequence"]
+        assert [sequence["vocab"][t] for t in sequence["tokens"]] == sequence["token_ids"]
+
+    def test_transformer_all_matches_single_formats(
+        self,
+        cfg_builder: CFGBuilder,
+        graph_converter: GraphConverter,
+        parsed_loop: list[ParsedClass],
+    ):
+        """Test the combined transformer output equals converting each format alone."""
+        classes = parsed_loop
+        graph, nodes, edges = cfg_builder.build_class_cfg(classes[0])
+        output = graph_converter.convert(graph, nodes, edges)
+
+        result = graph_converter.to_transformer_input(output, "all")
+
+        adjacency = graph_converter.to_transformer_input(output, "adjacency_matrix")
+        assert result["adjacency_matrix"]["node_type_ids"] == adjacency["node_type_ids"]
+        assert result["adjacency_matrix"]["node_type_vocab"] == adjacency["node_type_vocab"]
+        edge_list = graph_converter.to_transformer_input(output, "edge_list")
+        assert result["edge_list"]["node_features"] == edge_list["node_features"]
+        np.testing.assert_array_equal(result["edge_list"]["edge_index"], edge_list["edge_index"])
+
+    def test_sparse_and_dgl_exports_drop_dangling_edges(self, graph_converter: GraphConverter):
+        """Test sparse and DGL exports index the node list and skip unknown endpoints."""
+        nodes = [GraphNode(id=f"n{i}", type=NodeType.STATEMENT) for i in range(3)]
+        edges = [
+            GraphEdge(source="n0", target="n1", type=EdgeType.SEQUENTIAL),
+            GraphEdge(source="n1", target="missing", type=EdgeType.SEQUENTIAL),
+            GraphEdge(source="n2", target="n0", type=EdgeType.LOOP_BACK),
+        ]
+        graph = nx.DiGraph()
+        graph.add_edges_from((edge.source, edge.target) for edge in edges)
+        output = graph_converter.convert(graph, nodes, edges, formats={"edge_list"})
+
+        sparse = graph_converter.to_sparse_format(output)
+        edge_table = graph_converter.edge_table(output)
+        dgl = graph_converter.to_dgl_format(output, edge_table)
+
+        assert (sparse["row"], sparse["col"]) == ([0, 2], [1, 0])
+        assert sparse["edge_types"] == ["SEQUENTIAL", "LOOP_BACK"]
+        assert (dgl["src"], dgl["dst"]) == (sparse["row"], sparse["col"])
+        assert graph_converter.to_sparse_format(output, edge_table) == sparse
+        transformer = graph_converter.to_transformer_input(output, "edge_list", edge_table)
+        assert transformer["edge_index"].tolist() == [sparse["row"], sparse["col"]]
+
+    def test_tokenize_code_splits_special_characters(self, graph_converter: GraphConverter):
+        """Test code tokens split on whitespace and special characters, capped in length."""
+        assert graph_converter._tokenize_code('  x+=foo(a[i], "s@t");') == [
+            "x", "+", "=", "foo", "(", "a", "[", "i", "]", ",", '"s@t"', ")", ";",
+        ]
+        assert graph_converter._tokenize_code("") == []
+
+        long_tokens = graph_converter._tokenize_code(" ".join(["a"] * 60))
+        assert long_tokens == ["a"] * 50 + ["..."]
+
+    def test_large_sparse_adjacency_uses_coo(self, graph_converter: GraphConverter):
+        """Test large, sparse graphs get COO adjacency matching the dense cells."""
+        nodes = [GraphNode(id=f"n{i}", type=NodeType.STATEMENT) for i in range(300)]
+        edges = [
+            GraphEdge(source=source.id, target=target.id, type=EdgeType.SEQUENTIAL)
+            for source, target in zip(nodes, nodes[1:])
+        ]
+        # A second edge into an existing cell overrides its type, as in the dense matrix
+        edges.append(GraphEdge(source="n5", target="n6", type=EdgeType.DATA_DEP))
+        edges.append(GraphEdge(source="n299", target="n0", type=EdgeType.LOOP_BACK))
+        graph = nx.DiGraph()
+        graph.add_edges_from((edge.source, edge.target) for edge in edges)
+
+        adj = graph_converter.convert(graph, nodes, edges, formats={"adjacency_matrix"}).adjacency_matrix
+
+        assert adj.sparse
+        assert adj.matrix.size == 0
+        assert list(zip(adj.rows.tolist(), adj.cols.tolist())) == sorted(
+            {(int(e.source[1:]), int(e.target[1:])) for e in edges}
+        )
+        codes = dict(zip(zip(adj.rows.tolist(), adj.cols.tolist()), adj.coo_edge_type_codes.tolist()))
+        assert adj.edge_type_vocab[codes[(5, 6)]] == "DATA_DEP"
+        assert adj.edge_type_vocab[codes[(299, 0)]] == "LOOP_BACK"
+
+        result = graph_converter.to_transformer_input(
+            GraphOutput(edge_list=EdgeListFormat(), adjacency_matrix=adj, sequence=SequenceFormat()),
+            "adjacency_matrix",
+        )
+        assert result["sparse"]
+        assert result["edge_type_codes"].tolist() == adj.coo_edge_type_codes.tolist()
+        assert result["indices"].shape == (2, len(adj.rows))
@@ -2,16 +2,47 @@
 
 import pytest
 
-from app.services.java_parser import JavaParser, ParsedClass, ParsedMethod
+from app.services.java_parser import JavaParser, ParsedClass, ParsedMethod, class_without_ast
 from app.core.exceptions import JavaParseError, InvalidJavaCodeError
 
 
+def _check_methods(classes: list[ParsedClass], methods: dict[str, ParsedMethod]) -> None:
+    """Check the class and all three of its methods are found."""
+    assert len(classes) == 1
+    calc_class = classes[0]
+    assert calc_class.name == "Calculator"
+    assert len(calc_class.methods) == 3
+
+    method_names = [m.name for m in calc_class.methods]
+    assert "add" in method_names
+    assert "factorial" in method_names
+    assert "divide" in method_names
+
+
+def _check_fields(classes: list[ParsedClass], methods: dict[str, ParsedMethod]) -> None:
+    """Check class fields are extracted."""
+    assert len(classes[0].fields) == 1
+    assert "result" in classes[0].fields
+
+
+def _check_method_parameters(classes: list[ParsedClass], methods: dict[str, ParsedMethod]) -> None:
+    """Check method parameters and their types are extracted."""
+    add_method = methods["add"]
+    assert add_method.parameters == ["a", "b"]
+    assert add_method.parameter_types == ["int", "int"]
+
+
+def _statement_types(method: ParsedMethod) -> set[str]:
+    """Get the types of a method's top-level statements."""
+    return {stmt.statement_type for stmt in method.statements}
+
+
 class TestJavaParser:
     """Test cases for JavaParser."""
 
-    def test_parse_simple_class(self, java_parser: JavaParser, simple_java_method: str):
+    def test_parse_simple_class(self, parsed_simple: list[ParsedClass]):
         """Test parsing a simple Java class."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
 
         assert len(classes) == 1
         assert classes[0].name == "Simple"
@@ -22,97 +53,57 @@ class TestJavaParser:
         assert method.parameters == ["x", "y"]
         assert method.return_type == "int"
 
-    def test_parse_multiple_methods(self, java_parser: JavaParser, sample_java_code: str):
-        """Test parsing class with multiple methods."""
-        classes = java_parser.parse(sample_java_code)
-
-        assert len(classes) == 1
-        calc_class = classes[0]
-        assert calc_class.name == "Calculator"
-        assert len(calc_class.methods) == 3
-
-        method_names = [m.name for m in calc_class.methods]
-        assert "add" in method_names
-        assert "factorial" in method_names
-        assert "divide" in method_names
-
-    def test_parse_field_extraction(self, java_parser: JavaParser, sample_java_code: str):
-        """Test extracting class fields."""
-        classes = java_parser.parse(sample_java_code)
-
-        assert len(classes[0].fields) == 1
-        assert "result" in classes[0].fields
-
-    def test_parse_method_parameters(self, java_parser: JavaParser, sample_java_code: str):
-        """Test extracting method parameters."""
-        classes = java_parser.parse(sample_java_code)
-
-        add_method = next(m for m in classes[0].methods if m.name == "add")
-        assert add_method.parameters == ["a", "b"]
-        assert add_method.parameter_types == ["int", "int"]
-
-    def test_parse_statements(self, java_parser: JavaParser, simple_java_method: str):
+    @pytest.mark.parametrize(
+        "check",
+        [_check_methods, _check_fields, _check_method_parameters],
+        ids=["methods", "fields", "parameters"],
+    )
+    def test_parse_sample_class(
+        self, parsed_sample: list[ParsedClass], methods_by_name: dict[str, ParsedMethod], check
+    ):
+        """Test one property of the parsed Calculator class."""
+        check(parsed_sample, methods_by_name)
+
+    def test_parse_statements(self, parsed_simple: list[ParsedClass]):
         """Test parsing method statements."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
         assert len(method.statements) >= 2  # declaration and return
 
-    def test_parse_if_statement(self, java_parser: JavaParser, conditional_java_code: str):
-        """Test parsing if statements."""
-        classes = java_parser.parse(conditional_java_code)
-        abs_method = next(m for m in classes[0].methods if m.name == "abs")
-
-        # Should have if statement
-        assert any(s.statement_type == "IF" for s in abs_method.statements)
-
-    def test_parse_for_loop(self, java_parser: JavaParser, loop_java_code: str):
-        """Test parsing for loops."""
-        classes = java_parser.parse(loop_java_code)
-        sum_method = next(m for m in classes[0].methods if m.name == "sumArray")
-
-        # Should have for statement
-        has_for = any(s.statement_type == "FOR" for s in sum_method.statements)
-        assert has_for
-
-    def test_parse_while_loop(self, java_parser: JavaParser, loop_java_code: str):
-        """Test parsing while loops."""
-        classes = java_parser.parse(loop_java_code)
-        while_method = next(m for m in classes[0].methods if m.name == "whileExample")
-
-        # Should have while statement
-        has_while = any(s.statement_type == "WHILE" for s in while_method.statements)
-        assert has_while
-
-    def test_parse_try_catch(self, java_parser: JavaParser, sample_java_code: str):
-        """Test parsing try-catch blocks."""
-        classes = java_parser.parse(sample_java_code)
-        divide_method = next(m for m in classes[0].methods if m.name == "divide")
-
-        # Should have try statement
-        has_try = any(s.statement_type == "TRY" for s in divide_method.statements)
-        assert has_try
-
-    def test_variable_extraction(self, java_parser: JavaParser, simple_java_method: str):
+    @pytest.mark.parametrize(
+        "method_name, statement_type",
+        [("abs", "IF"), ("sumArray", "FOR"), ("whileExample", "WHILE"), ("divide", "TRY")],
+        ids=["if", "for", "while", "try"],
+    )
+    def test_parse_statement_type(
+        self, methods_by_name: dict[str, ParsedMethod], method_name: str, statement_type: str
+    ):
+        """Test control structures are parsed into statements of their type."""
+        assert statement_type in _statement_types(methods_by_name[method_name])
+
+    def test_variable_extraction(self, parsed_simple: list[ParsedClass]):
         """Test variable definition and use extraction."""
-        classes = java_parser.parse(simple_java_method)
+        classes = parsed_simple
         method = classes[0].methods[0]
 
-        # Find statements with variables
-        all_defined = []
-        all_used = []
-        for stmt in method.statements:
-            all_defined.extend(stmt.variables_defined)
-            all_used.extend(stmt.variables_used)
-
         # Should have 'result' as defined
-        assert "result" in all_defined
-
-    def test_parse_invalid_java(self, java_parser: JavaParser):
-        """Test parsing invalid Java code raises error."""
-        invalid_code = "this is not java code {"
-
-        with pytest.raises((JavaParseError, InvalidJavaCodeError)):
+        assert any("result" in stmt.variables_defined for stmt in method.statements)
+
+    @pytest.mark.parametrize(
+        "invalid_code, error",
+        [
+            ("this is not java code {", JavaParseError),
+            ("class {", JavaParseError),
+            ("public class X", JavaParseError),
+            ('class X { String s = "abc; }', InvalidJavaCodeError),
+            ("class X { # }", InvalidJavaCodeError),
+        ],
+        ids=["not_java", "unnamed_class", "missing_body", "unterminated_string", "bad_token"],
+    )
+    def test_parse_invalid_java(self, java_parser: JavaParser, invalid_code: str, error: type[Exception]):
+        """Test syntax errors raise JavaParseError and lexer errors InvalidJavaCodeError."""
+        with pytest.raises(error):
             java_parser.parse(invalid_code)
 
     def test_parse_empty_class(self, java_parser: JavaParser):
@@ -141,3 +132,18 @@ class TestJavaParser:
         constructor = classes[0].methods[0]
         assert constructor.is_constructor
         assert constructor.name == "Person"
+
+    def test_class_without_ast(self, parsed_conditional: list[ParsedClass]):
+        """Test detaching the AST keeps everything graph building reads."""
+        parsed_class = parsed_conditional[0]
+
+        detached = class_without_ast(parsed_class)
+
+        def nodes(statements):
+            for stmt in statements:
+                yield stmt.node
+                yield from nodes(stmt.children)
+
+        assert all(node is None for m in detached.methods for node in nodes(m.statements))
+        assert any(node is not None for m in parsed_class.methods for node in nodes(m.statements))
+        assert [m.source_hash for m in detached.methods] == [m.source_hash for m in parsed_class.methods]
@@ -0,0 +1,34 @@
+"""Tests for the object pool."""
+
+from app.utils.pool import ObjectPool
+
+
+class TestObjectPool:
+    """Test cases for ObjectPool."""
+
+    def test_reuses_released_objects(self):
+        """Test a released object is handed out again."""
+        pool = ObjectPool(object, max_size=2)
+
+        first = pool.acquire()
+        pool.release(first)
+
+        assert pool.acquire() is first
+
+    def test_creates_objects_when_empty(self):
+        """Test concurrent borrowers get distinct objects."""
+        pool = ObjectPool(object, max_size=2)
+
+        with pool.borrow() as first, pool.borrow() as second:
+            assert first is not second
+
+    def test_drops_objects_beyond_max_size(self):
+        """Test the pool keeps at most max_size idle objects."""
+        pool = ObjectPool(object, max_size=1)
+        first, second = pool.acquire(), pool.acquire()
+
+        pool.release(first)
+        pool.release(second)
+
+        assert pool.acquire() is first
+        assert pool.acquire() is not second